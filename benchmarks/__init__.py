@@ -0,0 +1 @@
+# Pruebas de rendimiento de las funciones de acceso a datos
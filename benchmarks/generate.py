@@ -0,0 +1,113 @@
+# Generador de datos sintéticos con la forma de user_data.json
+#
+# Crea usuarios con una ciudad al azar y consumo en cada uno de los últimos
+# días (hasta hoy), con una muestra aleatoria de actividades por día. Con la
+# misma semilla se obtiene siempre el mismo conjunto de datos. Los usuarios
+# se generan y se escriben uno a uno, de modo que el archivo JSON no se
+# construye entero en memoria.
+#
+# Uso: python -m benchmarks.generate --users 1000 --days 365 --out bench_data.json [--backend sqlite]
+
+import argparse
+import json
+import random
+from datetime import datetime, timedelta
+
+from consumption import day_liters
+from data import water_activities, water_rates
+from storage import create_storage
+
+DEFAULT_SEED = 42
+MAX_ACTIVITIES_PER_DAY = len(water_activities)
+MAX_QUANTITY = 4
+
+
+def generate_record(rng, days, today=None):
+    """
+    Genera el registro de un usuario con consumo en los últimos días
+    """
+    today = today or datetime.now().date()
+    activities = list(water_activities)
+    consumption = {}
+    totals = {}
+
+    for offset in range(days - 1, -1, -1):
+        date = (today - timedelta(days=offset)).strftime("%Y-%m-%d")
+        sample = rng.sample(activities, rng.randint(1, MAX_ACTIVITIES_PER_DAY))
+        day = {activity: rng.randint(1, MAX_QUANTITY) for activity in sample}
+        consumption[date] = day
+        totals[date] = day_liters(day)
+
+    return {
+        "city": rng.choice(list(water_rates)),
+        "consumption": consumption,
+        "daily_totals": totals,
+        "total_liters": sum(totals.values()),
+        "tips_shown": [],
+    }
+
+
+def generate_users(users, days, seed=DEFAULT_SEED, today=None):
+    """
+    Genera los usuarios sintéticos uno a uno
+
+    Yields:
+        Tuplas (nombre, registro)
+    """
+    rng = random.Random(seed)
+    for i in range(users):
+        yield f"usuario_{i:06d}", generate_record(rng, days, today)
+
+
+def write_json(path, users):
+    """
+    Escribe los usuarios en un archivo con el formato de user_data.json, uno a uno
+    """
+    count = 0
+    with open(path, 'w') as f:
+        f.write("{")
+        for username, record in users:
+            if count:
+                f.write(",")
+            f.write(f"{json.dumps(username)}:{json.dumps(record)}")
+            count += 1
+        f.write("}")
+    return count
+
+
+def write_sqlite(path, users):
+    """
+    Escribe los usuarios en una base SQLite, uno a uno
+    """
+    storage = create_storage("sqlite", path)
+    count = 0
+    for username, record in users:
+        storage.upsert_user(username, record)
+        count += 1
+    return count
+
+
+WRITERS = {"json": write_json, "sqlite": write_sqlite}
+
+
+def generate(path, users, days, backend="json", seed=DEFAULT_SEED):
+    """
+    Genera un conjunto de datos sintético y lo escribe con el motor indicado
+
+    Returns:
+        Número de usuarios escritos
+    """
+    return WRITERS[backend](path, generate_users(users, days, seed))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera datos de consumo sintéticos")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--backend", choices=list(WRITERS), default="json")
+    parser.add_argument("--out", required=True, help="Archivo de salida (.json o .db)")
+    args = parser.parse_args()
+
+    count = generate(args.out, args.users, args.days, args.backend, args.seed)
+    print(f"{count} usuarios x {args.days} días escritos en {args.out}")
@@ -0,0 +1,224 @@
+# Prueba de carga de sesiones concurrentes sobre el almacenamiento
+#
+# Simula varias sesiones de la aplicación a la vez, con procesos y con hilos
+# dentro de cada proceso (Streamlit atiende cada sesión en su propio hilo).
+# Cada sesión repite el recorrido registrar consumo -> gráfico semanal ->
+# consejo -> exportación usando las mismas funciones que las pantallas, sobre
+# un grupo de cuentas compartidas para provocar escrituras simultáneas a un
+# mismo usuario. Al final compara los registros guardados con los esperados
+# para contar las actualizaciones perdidas.
+#
+# Uso: python -m benchmarks.load_test [--processes 4] [--threads 8] [--iterations 20]
+#                                     [--accounts 10] [--backend json|sqlite] [--users 200]
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+
+from benchmarks.generate import generate
+
+# Cada registro suma una única ducha, para poder contar los registros guardados
+LOAD_ACTIVITY = "shower"
+STEPS = ["register", "weekly_chart", "tips", "export", "session"]
+
+
+def percentile(samples, fraction):
+    """
+    Devuelve el percentil de una lista de muestras ya ordenada
+    """
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def run_session(accounts, iterations, seed, latencies, registered):
+    """
+    Recorrido de una sesión simulada
+
+    Args:
+        accounts: Cuentas entre las que elige en cada iteración
+        iterations: Número de recorridos completos
+        seed: Semilla de la sesión
+        latencies: Dict {paso: [milisegundos]} donde acumular los tiempos
+        registered: Counter {cuenta: registros hechos} donde contar los registros
+    """
+    # Las funciones de la aplicación se importan en cada proceso, ya configurado
+    from exporter import export_bytes
+    from users import load_user, register_consumption, get_weekly_consumption, record_tip_shown
+    from utils import get_water_saving_tips
+    from views.common import build_weekly_chart
+    from figure_cache import cached_figure
+
+    rng = random.Random(seed)
+    for _ in range(iterations):
+        username = rng.choice(accounts)
+        session_start = step_start = time.perf_counter()
+
+        total = register_consumption(username, {LOAD_ACTIVITY: 1})
+        registered[username] += 1
+        latencies["register"].append((time.perf_counter() - step_start) * 1000)
+
+        step_start = time.perf_counter()
+        cached_figure(build_weekly_chart, get_weekly_consumption(username))
+        latencies["weekly_chart"].append((time.perf_counter() - step_start) * 1000)
+
+        step_start = time.perf_counter()
+        tips = get_water_saving_tips(total)
+        if tips:
+            record_tip_shown(username, tips)
+        latencies["tips"].append((time.perf_counter() - step_start) * 1000)
+
+        step_start = time.perf_counter()
+        export_bytes(username, load_user(username), "csv")
+        now = time.perf_counter()
+        latencies["export"].append((now - step_start) * 1000)
+        latencies["session"].append((now - session_start) * 1000)
+
+
+def warm_up():
+    """
+    Importa en cada proceso lo que la primera sesión cargaría de forma diferida,
+    para que las latencias reflejen un servidor ya en marcha
+    """
+    import pandas
+    import plotly.express
+    import exporter
+    import views.common
+
+
+def run_process(worker, threads, accounts, iterations, seed):
+    """
+    Ejecuta varias sesiones en hilos dentro de un proceso
+
+    Returns:
+        Tupla (latencias por paso, registros por cuenta)
+    """
+    latencies = defaultdict(list)
+    registered = Counter()
+    lock = threading.Lock()
+
+    def session(thread):
+        local_latencies = defaultdict(list)
+        local_registered = Counter()
+        run_session(accounts, iterations, seed * 1000 + worker * 100 + thread,
+                    local_latencies, local_registered)
+        with lock:
+            for step, samples in local_latencies.items():
+                latencies[step].extend(samples)
+            registered.update(local_registered)
+
+    pool = [threading.Thread(target=session, args=(thread,)) for thread in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return dict(latencies), registered
+
+
+def stored_counts(accounts, date):
+    """
+    Devuelve las duchas guardadas hoy en cada cuenta
+    """
+    from storage import get_storage
+    storage = get_storage()
+    if hasattr(storage, "invalidate_cache"):
+        storage.invalidate_cache()
+    return {username: storage.get_user(username)["consumption"].get(date, {}).get(LOAD_ACTIVITY, 0)
+            for username in accounts}
+
+
+def load_test(processes, threads, iterations, accounts, seed=0):
+    """
+    Ejecuta la prueba de carga sobre el almacenamiento configurado
+
+    Returns:
+        Dict con latencias (p50/p95/p99) por paso, rendimiento y actualizaciones perdidas
+    """
+    from storage import get_storage
+
+    accounts = get_storage().list_users()[:accounts]
+    today = datetime.now().strftime("%Y-%m-%d")
+    before = stored_counts(accounts, today)
+
+    # Procesos nuevos ("spawn"): un fork heredaría la conexión SQLite y el
+    # estado del almacenamiento abiertos arriba por get_storage()
+    with multiprocessing.get_context("spawn").Pool(processes, initializer=warm_up) as pool:
+        start = time.perf_counter()
+        results = pool.starmap(run_process, [(worker, threads, accounts, iterations, seed)
+                                             for worker in range(processes)])
+        elapsed = time.perf_counter() - start
+
+    latencies = defaultdict(list)
+    registered = Counter()
+    for process_latencies, process_registered in results:
+        for step, samples in process_latencies.items():
+            latencies[step].extend(samples)
+        registered.update(process_registered)
+
+    after = stored_counts(accounts, today)
+    lost = sum(registered[username] - (after[username] - before[username]) for username in accounts)
+    sessions = len(latencies["session"])
+
+    summary = {}
+    for step in STEPS:
+        samples = sorted(latencies[step])
+        summary[step] = {
+            "p50_ms": percentile(samples, 0.50),
+            "p95_ms": percentile(samples, 0.95),
+            "p99_ms": percentile(samples, 0.99),
+            "mean_ms": statistics.fmean(samples),
+        }
+
+    return {
+        "sessions": processes * threads,
+        "iterations": sessions,
+        "seconds": elapsed,
+        "throughput": sessions / elapsed,
+        "registered": sum(registered.values()),
+        "lost_updates": lost,
+        "latency": summary,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prueba de carga de sesiones concurrentes")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=8, help="Sesiones por proceso")
+    parser.add_argument("--iterations", type=int, default=20, help="Recorridos por sesión")
+    parser.add_argument("--accounts", type=int, default=10, help="Cuentas compartidas entre las sesiones")
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json")
+    parser.add_argument("--users", type=int, default=200, help="Usuarios del conjunto de datos generado")
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--data", help="Conjunto de datos existente (se modifica); por defecto se genera uno temporal")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="Archivo JSON donde guardar el resultado")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.data
+        if path is None:
+            path = os.path.join(tmp, "load_test.db" if args.backend == "sqlite" else "load_test.json")
+            generate(path, args.users, args.days, args.backend)
+
+        # Los procesos de la prueba heredan la configuración del almacenamiento
+        os.environ["H2OMIGA_STORAGE"] = args.backend
+        os.environ["H2OMIGA_DATA_PATH"] = path
+        result = load_test(args.processes, args.threads, args.iterations, args.accounts, args.seed)
+
+    print(f"{result['sessions']} sesiones, {result['iterations']} recorridos en {result['seconds']:.1f} s "
+          f"({result['throughput']:.1f} recorridos/s)")
+    print(f"{'paso':<14}{'p50':>10}{'p95':>10}{'p99':>10}  (ms)")
+    for step, stats in result["latency"].items():
+        print(f"{step:<14}{stats['p50_ms']:10.1f}{stats['p95_ms']:10.1f}{stats['p99_ms']:10.1f}")
+    print(f"Actualizaciones perdidas: {result['lost_updates']} de {result['registered']}")
+
+    if args.out:
+        result["config"] = vars(args)
+        with open(args.out, 'w') as f:
+            json.dump(result, f, indent=2)
@@ -0,0 +1,208 @@
+# Pruebas de rendimiento de las funciones de acceso a datos
+#
+# Para cada tamaño se genera un conjunto de datos sintético y se miden, en
+# un proceso nuevo que usa ese conjunto como almacenamiento, las mismas
+# funciones que usa la aplicación: carga y guardado completos, registro de
+# consumo, consultas diaria y semanal, actualización de tips_shown y
+# exportación. Los resultados se guardan en un JSON con la fecha, el commit
+# y la configuración, para comparar ejecuciones a lo largo del tiempo.
+#
+# Uso: python -m benchmarks.run [--sizes 1000,10000] [--days 365] [--backend json|sqlite]
+#                               [--repeat 20] [--out benchmarks/results] [--compare anterior.json]
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.generate import generate, DEFAULT_SEED
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SIZES = [1000]
+DEFAULT_REPEAT = 20
+DEFAULT_BULK_REPEAT = 3
+
+
+def timed(fn, runs, warmup=0):
+    """
+    Ejecuta fn(i) varias veces y resume los tiempos en milisegundos
+
+    Args:
+        fn: Función a medir, recibe el número de ejecución
+        runs: Ejecuciones medidas
+        warmup: Ejecuciones previas sin medir (importaciones diferidas, cachés)
+    """
+    for i in range(warmup):
+        fn(i)
+    samples = []
+    for i in range(runs):
+        start = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "runs": runs,
+        "min_ms": samples[0],
+        "median_ms": statistics.median(samples),
+        "mean_ms": statistics.fmean(samples),
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "max_ms": samples[-1],
+    }
+
+
+def run_suite(repeat=DEFAULT_REPEAT, bulk_repeat=DEFAULT_BULK_REPEAT, seed=DEFAULT_SEED):
+    """
+    Mide las funciones de acceso a datos sobre el almacenamiento configurado
+
+    Returns:
+        Dict {operación: estadísticas de tiempo}
+    """
+    # Importar después de configurar el almacenamiento por variables de entorno
+    from exporter import EXPORT_FORMATS, iter_export
+    from storage import get_storage
+    from users import (
+        load_user_data, save_user_data, load_user, register_consumption,
+        get_daily_consumption, get_weekly_consumption, record_tip_shown
+    )
+    from data import water_activities
+    from utils import get_water_saving_tips
+
+    rng = random.Random(seed)
+    storage = get_storage()
+    usernames = storage.list_users()
+    activities = list(water_activities)
+    tips = get_water_saving_tips(150)
+    results = {}
+
+    def random_user(_):
+        return rng.choice(usernames)
+
+    if hasattr(storage, "invalidate_cache"):
+        def load_cold(_):
+            storage.invalidate_cache()
+            load_user_data()
+        results["load_user_data_cold"] = timed(load_cold, bulk_repeat)
+
+    results["load_user_data"] = timed(lambda _: load_user_data(), bulk_repeat)
+
+    data = load_user_data()
+    results["save_user_data"] = timed(lambda _: save_user_data(data), bulk_repeat)
+    del data
+
+    results["register_consumption"] = timed(
+        lambda i: register_consumption(random_user(i), {rng.choice(activities): rng.randint(1, 3)}),
+        repeat
+    )
+    results["get_daily_consumption"] = timed(lambda i: get_daily_consumption(random_user(i)), repeat)
+    results["get_weekly_consumption"] = timed(lambda i: get_weekly_consumption(random_user(i)), repeat)
+    results["record_tip_shown"] = timed(lambda i: record_tip_shown(random_user(i), tips), repeat)
+
+    for export_format in EXPORT_FORMATS:
+        results[f"export_{export_format}"] = timed(
+            lambda i: b"".join(iter_export(load_user(random_user(i)), export_format)), repeat,
+            warmup=1
+        )
+
+    return results
+
+
+def run_dataset(path, backend, repeat, bulk_repeat, seed):
+    """
+    Ejecuta run_suite en un proceso nuevo con el conjunto de datos indicado
+    """
+    env = dict(os.environ, H2OMIGA_STORAGE=backend, H2OMIGA_DATA_PATH=path)
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.run", "--suite", "--repeat", str(repeat),
+         "--bulk-repeat", str(bulk_repeat), "--seed", str(seed)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, current):
+    """
+    Muestra la variación de la mediana de cada operación respecto a una ejecución anterior
+    """
+    for size, operations in current["results"].items():
+        previous = baseline["results"].get(size, {})
+        print(f"\n{size} usuarios")
+        for name, stats in operations.items():
+            if name in previous:
+                change = stats["median_ms"] / previous[name]["median_ms"] * 100 - 100
+                print(f"  {name:<24} {previous[name]['median_ms']:10.2f} -> {stats['median_ms']:10.2f} ms  ({change:+.1f}%)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mide el rendimiento de las funciones de acceso a datos")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="Número de usuarios de cada conjunto, separados por comas")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="Repeticiones de las operaciones sobre un usuario")
+    parser.add_argument("--bulk-repeat", type=int, default=DEFAULT_BULK_REPEAT,
+                        help="Repeticiones de la carga y el guardado completos")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--out", default=os.path.join("benchmarks", "results"),
+                        help="Directorio donde guardar los resultados")
+    parser.add_argument("--compare", help="Resultados anteriores con los que comparar")
+    parser.add_argument("--suite", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Proceso hijo: medir el almacenamiento configurado e imprimir el resultado
+    if args.suite:
+        print(json.dumps(run_suite(args.repeat, args.bulk_repeat, args.seed)))
+        sys.exit(0)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    report = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"sizes": sizes, "days": args.days, "backend": args.backend,
+                   "repeat": args.repeat, "bulk_repeat": args.bulk_repeat, "seed": args.seed},
+        "generate_seconds": {},
+        "results": {},
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            path = os.path.join(tmp, f"bench_{size}.{'db' if args.backend == 'sqlite' else 'json'}")
+            start = time.perf_counter()
+            generate(path, size, args.days, args.backend, args.seed)
+            report["generate_seconds"][size] = time.perf_counter() - start
+
+            report["results"][size] = run_dataset(path, args.backend, args.repeat,
+                                                  args.bulk_repeat, args.seed)
+            print(f"{size} usuarios:")
+            for name, stats in report["results"][size].items():
+                print(f"  {name:<24} mediana {stats['median_ms']:10.2f} ms   p95 {stats['p95_ms']:10.2f} ms")
+
+    os.makedirs(args.out, exist_ok=True)
+    out_path = os.path.join(args.out, f"{datetime.now():%Y%m%d-%H%M%S}-{args.backend}.json")
+    with open(out_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Resultados guardados en {out_path}")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        # Las claves de tamaño se leen del JSON como texto
+        report = json.loads(json.dumps(report))
+        compare(baseline, report)
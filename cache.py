@@ -0,0 +1,55 @@
+# Caché LRU compartida por el proceso, limitada por el tamaño de su contenido
+#
+# La usan la exportación de datos (bytes generados) y los gráficos (figuras
+# de Plotly). Cada elemento se guarda con su tamaño en bytes y, al superar
+# el máximo, se descartan los usados hace más tiempo.
+
+import threading
+from collections import OrderedDict
+
+
+class SizedLRUCache:
+    """
+    Caché LRU limitada en bytes
+
+    Attributes:
+        max_bytes: Tamaño máximo del contenido guardado
+        size: Tamaño actual del contenido guardado
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items = OrderedDict()  # clave -> (valor, tamaño)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key][0]
+        return None
+
+    def put(self, key, value, size=None):
+        """
+        Guarda un valor; si no se indica su tamaño se usa len(value)
+        """
+        size = len(value) if size is None else size
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._items:
+                self.size -= self._items.pop(key)[1]
+            self._items[key] = (value, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted_size) = self._items.popitem(last=False)
+                self.size -= evicted_size
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.size = 0
@@ -0,0 +1,308 @@
+# Estadísticas de consumo por ciudad calculadas con los usuarios registrados
+#
+# El valor de cada usuario es su promedio diario de los últimos WINDOW_DAYS
+# días naturales (litros de la ventana / WINDOW_DAYS), el mismo que muestra
+# la pestaña Comparativa; los usuarios sin registros en la ventana no
+# cuentan. Por ciudad y a nivel nacional se mantienen el número de usuarios,
+# la suma y un árbol de Fenwick con la cantidad de usuarios por intervalo de
+# 0.1 L/día, de modo que media, mediana y percentiles se obtienen en
+# O(log n) sin recorrer ni ordenar a los usuarios. El índice se construye una
+# vez al día por proceso (la ventana avanza con la fecha) y luego se
+# actualiza al registrar consumo o cambiar de ciudad. Con pocos usuarios se
+# usan las tablas de data.py.
+
+import threading
+from datetime import datetime, timedelta
+
+from consumption import daily_totals
+from data import city_avg_consumption, NATIONAL_AVG_CONSUMPTION
+from storage import get_storage
+
+# Usuarios mínimos para usar los datos reales en lugar de la tabla de referencia
+MIN_CITY_USERS = 5
+MIN_NATIONAL_USERS = 20
+
+# Resolución y rango de los promedios diarios en el índice (litros por día).
+# El promedio puede ser negativo (p. ej. si sólo se registró reparar una
+# fuga); los valores fuera del rango se cuentan en el primer o último intervalo
+RESOLUTION = 0.1
+MIN_DAILY_LITERS = -100
+MAX_DAILY_LITERS = 2000
+BUCKETS = int(round((MAX_DAILY_LITERS - MIN_DAILY_LITERS) / RESOLUTION)) + 1
+
+
+# Días naturales (hasta hoy) del promedio de cada usuario
+WINDOW_DAYS = 7
+
+
+def window_dates(today=None):
+    """
+    Devuelve las fechas de la ventana que termina en today (por defecto hoy), de la más antigua a la más reciente
+    """
+    today = today or datetime.now().date()
+    return [(today - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(WINDOW_DAYS - 1, -1, -1)]
+
+
+def window_average(liters, days):
+    """
+    Devuelve el promedio diario de la ventana, o None si no hay días registrados en ella
+    """
+    return liters / WINDOW_DAYS if days else None
+
+
+def _bucket(value):
+    return min(max(int(round((value - MIN_DAILY_LITERS) / RESOLUTION)), 0), BUCKETS - 1)
+
+
+def _bucket_value(bucket):
+    return MIN_DAILY_LITERS + bucket * RESOLUTION
+
+
+class FenwickTree:
+    """
+    Árbol de Fenwick de conteos: actualización, prefijos y k-ésimo en O(log n)
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.tree = [0] * (size + 1)
+        self.top = 1 << (size.bit_length() - 1)
+
+    @classmethod
+    def from_counts(cls, counts):
+        """
+        Construye el árbol a partir de una lista de conteos en O(n)
+        """
+        fenwick = cls(len(counts))
+        tree = fenwick.tree
+        tree[1:] = counts
+        for index in range(1, fenwick.size + 1):
+            parent = index + (index & -index)
+            if parent <= fenwick.size:
+                tree[parent] += tree[index]
+        return fenwick
+
+    def add(self, index, delta):
+        """
+        Suma delta al conteo de la posición index (desde 0)
+        """
+        if not 0 <= index < self.size:
+            raise IndexError(f"Posición fuera del árbol: {index}")
+        index += 1
+        while index <= self.size:
+            self.tree[index] += delta
+            index += index & -index
+
+    def prefix(self, index):
+        """
+        Devuelve la suma de los conteos de las posiciones [0, index)
+        """
+        total = 0
+        while index > 0:
+            total += self.tree[index]
+            index -= index & -index
+        return total
+
+    def kth(self, k):
+        """
+        Devuelve la posición del k-ésimo elemento (desde 1) en orden ascendente
+        """
+        position = 0
+        step = self.top
+        while step:
+            following = position + step
+            if following <= self.size and self.tree[following] < k:
+                position = following
+                k -= self.tree[following]
+            step >>= 1
+        return position
+
+
+class RunningStats:
+    """
+    Conteo, suma y distribución de los promedios de un grupo de usuarios
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.tree = FenwickTree(BUCKETS)
+
+    @classmethod
+    def from_values(cls, values):
+        """
+        Construye las estadísticas de un grupo de valores de una sola vez
+        """
+        stats = cls()
+        counts = [0] * stats.tree.size
+        for value in values:
+            counts[_bucket(value)] += 1
+        stats.count = len(values)
+        stats.total = float(sum(values))
+        stats.tree = FenwickTree.from_counts(counts)
+        return stats
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.tree.add(_bucket(value), 1)
+
+    def remove(self, value):
+        self.count -= 1
+        self.total -= value
+        self.tree.add(_bucket(value), -1)
+
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def median(self):
+        if not self.count:
+            return None
+        lower = self.tree.kth((self.count + 1) // 2)
+        upper = self.tree.kth(self.count // 2 + 1)
+        return (_bucket_value(lower) + _bucket_value(upper)) / 2
+
+    def percentile(self, value):
+        """
+        Devuelve el porcentaje de usuarios del grupo con un promedio menor a value
+        (los empates cuentan la mitad)
+        """
+        if not self.count:
+            return None
+        bucket = _bucket(value)
+        below = self.tree.prefix(bucket)
+        equal = self.tree.prefix(bucket + 1) - below
+        return (below + equal / 2) / self.count * 100
+
+
+class CityStats:
+    """
+    Índice de promedios diarios de los usuarios por ciudad
+    """
+
+    def __init__(self, day=None):
+        self.day = day or datetime.now().date()
+        self._users = {}  # usuario -> (ciudad, promedio diario de la ventana)
+        self._cities = {}
+        self._national = RunningStats()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_storage(cls, storage, day=None):
+        """
+        Construye el índice con los litros de la ventana de cada usuario
+        """
+        stats = cls(day)
+        dates = window_dates(stats.day)
+        values_by_city = {}
+        for username, city, liters, days in storage.window_totals(dates[0], dates[-1]):
+            value = window_average(liters, days)
+            if value is not None:
+                stats._users[username] = (city, value)
+                values_by_city.setdefault(city, []).append(value)
+
+        stats._cities = {city: RunningStats.from_values(values)
+                         for city, values in values_by_city.items()}
+        stats._national = RunningStats.from_values([value for city, value in stats._users.values()])
+        return stats
+
+    def update(self, username, city, value):
+        """
+        Actualiza el promedio de un usuario (o lo añade si es nuevo; None lo quita)
+        """
+        with self._lock:
+            previous = self._users.pop(username, None)
+            if previous is not None:
+                old_city, old_value = previous
+                self._cities[old_city].remove(old_value)
+                self._national.remove(old_value)
+            if value is not None:
+                self._users[username] = (city, value)
+                self._cities.setdefault(city, RunningStats()).add(value)
+                self._national.add(value)
+
+    def update_record(self, username, record):
+        """
+        Actualiza el promedio de un usuario a partir de su registro
+        """
+        totals = daily_totals(record)
+        dates = [date for date in window_dates(self.day) if date in totals]
+        self.update(username, record.get("city", "Lima"),
+                    window_average(sum(totals[date] for date in dates), len(dates)))
+
+    def city_summary(self, city):
+        """
+        Devuelve las estadísticas de una ciudad
+
+        Returns:
+            Dict con "count", "mean", "median" y "live" (False si, por haber
+            menos de MIN_CITY_USERS usuarios, se usa la tabla de referencia)
+        """
+        with self._lock:
+            stats = self._cities.get(city)
+            if stats is not None and stats.count >= MIN_CITY_USERS:
+                return {"count": stats.count, "mean": stats.mean(),
+                        "median": stats.median(), "live": True}
+            count = stats.count if stats is not None else 0
+
+        reference = city_avg_consumption.get(city, NATIONAL_AVG_CONSUMPTION)
+        return {"count": count, "mean": reference, "median": reference, "live": False}
+
+    def national_summary(self):
+        """
+        Devuelve las estadísticas nacionales, con el mismo formato que city_summary
+        """
+        with self._lock:
+            stats = self._national
+            if stats.count >= MIN_NATIONAL_USERS:
+                return {"count": stats.count, "mean": stats.mean(),
+                        "median": stats.median(), "live": True}
+            count = stats.count
+
+        return {"count": count, "mean": NATIONAL_AVG_CONSUMPTION,
+                "median": NATIONAL_AVG_CONSUMPTION, "live": False}
+
+    def percentile(self, username):
+        """
+        Devuelve la posición de un usuario dentro de su ciudad
+
+        Returns:
+            Dict con "city", "count" y "percentile" (porcentaje de usuarios de
+            la ciudad que consumen menos), o None si el usuario no tiene
+            consumo registrado o su ciudad tiene menos de MIN_CITY_USERS usuarios
+        """
+        with self._lock:
+            entry = self._users.get(username)
+            if entry is None:
+                return None
+            city, value = entry
+            stats = self._cities[city]
+            if stats.count < MIN_CITY_USERS:
+                return None
+            return {"city": city, "count": stats.count, "percentile": stats.percentile(value)}
+
+    def city_averages(self):
+        """
+        Devuelve el consumo diario promedio de cada ciudad {ciudad: litros}
+        """
+        with self._lock:
+            cities = set(city_avg_consumption) | set(self._cities)
+        return {city: self.city_summary(city)["mean"] for city in cities}
+
+
+_city_stats = None
+_city_stats_lock = threading.Lock()
+
+
+def get_city_stats():
+    """
+    Devuelve el índice de estadísticas por ciudad compartido por todo el proceso
+    """
+    global _city_stats
+    today = datetime.now().date()
+    if _city_stats is None or _city_stats.day != today:
+        with _city_stats_lock:
+            # Al cambiar de día la ventana avanza: se reconstruye el índice
+            if _city_stats is None or _city_stats.day != today:
+                _city_stats = CityStats.from_storage(get_storage(), today)
+    return _city_stats
@@ -0,0 +1,185 @@
+# Formato columnar de los registros de consumo
+#
+# Un directorio con una columna por archivo .npy (ancho fijo) y un meta.json:
+#   user_id.npy      int32  índice del usuario en meta["users"]
+#   day.npy          int32  días desde 1970-01-01
+#   activity_id.npy  int16  índice de la actividad en meta["activities"]
+#   count.npy        int32  cantidad registrada
+# Las filas están ordenadas por (user_id, day, activity_id). Los lectores
+# abren las columnas con memoria mapeada (np.load(mmap_mode="r")) y recorren
+# todos los usuarios sin construir diccionarios de Python.
+#
+# Uso: python columnar.py convert user_data.json consumo_columnar/
+
+import json
+import os
+import sys
+
+import numpy as np
+
+from consumption_matrix import ACTIVITY_INDEX, ACTIVITY_KEYS
+from data import water_activities
+from storage import create_storage
+
+FORMAT_VERSION = 1
+COLUMNS = {
+    "user_id": np.int32,
+    "day": np.int32,
+    "activity_id": np.int16,
+    "count": np.int32,
+}
+
+
+def _user_columns(user_id, consumption):
+    """
+    Convierte el detalle de un usuario en columnas ordenadas por día y actividad
+    """
+    rows = sorted(
+        (np.datetime64(date, "D").astype(np.int64), ACTIVITY_INDEX[activity], quantity)
+        for date, activities in consumption.items()
+        for activity, quantity in activities.items()
+    )
+    if not rows:
+        return None
+    days, activity_ids, counts = zip(*rows)
+    return (
+        np.full(len(rows), user_id, dtype=COLUMNS["user_id"]),
+        np.array(days, dtype=COLUMNS["day"]),
+        np.array(activity_ids, dtype=COLUMNS["activity_id"]),
+        np.array(counts, dtype=COLUMNS["count"]),
+    )
+
+
+def convert(user_data, out_dir):
+    """
+    Escribe un documento {usuario: registro} en formato columnar
+
+    Args:
+        user_data: Documento de usuarios (como el de user_data.json)
+        out_dir: Directorio de salida (se crea si no existe)
+
+    Returns:
+        Número de filas escritas
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    users = list(user_data)
+    chunks = [
+        columns for user_id, username in enumerate(users)
+        if (columns := _user_columns(user_id, user_data[username].get("consumption", {})))
+    ]
+
+    for position, (name, dtype) in enumerate(COLUMNS.items()):
+        column = (np.concatenate([chunk[position] for chunk in chunks])
+                  if chunks else np.empty(0, dtype=dtype))
+        np.save(os.path.join(out_dir, f"{name}.npy"), column)
+
+    meta = {
+        "version": FORMAT_VERSION,
+        "users": users,
+        "cities": [user_data[username].get("city", "Lima") for username in users],
+        "activities": ACTIVITY_KEYS,
+    }
+    with open(os.path.join(out_dir, "meta.json"), 'w') as f:
+        json.dump(meta, f)
+
+    return sum(len(chunk[0]) for chunk in chunks)
+
+
+class ColumnarConsumption:
+    """
+    Lector de un directorio en formato columnar con memoria mapeada
+    """
+
+    def __init__(self, path):
+        with open(os.path.join(path, "meta.json"), 'r') as f:
+            self.meta = json.load(f)
+        if self.meta["version"] != FORMAT_VERSION:
+            raise ValueError(f"Versión de formato columnar no soportada: {self.meta['version']}")
+
+        self.users = self.meta["users"]
+        self.cities = self.meta["cities"]
+        self.activities = self.meta["activities"]
+        self.user_index = {username: i for i, username in enumerate(self.users)}
+
+        for name in COLUMNS:
+            setattr(self, name, np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r"))
+
+        # Litros por uso según las actividades con las que se escribió el archivo
+        self.liters_vector = np.array([water_activities[activity]["liters"]
+                                       for activity in self.activities])
+
+    def __len__(self):
+        return len(self.count)
+
+    def liters(self, rows=slice(None)):
+        """
+        Devuelve los litros de cada fila
+        """
+        return self.count[rows] * self.liters_vector[self.activity_id[rows]]
+
+    def user_rows(self, username):
+        """
+        Devuelve el rango de filas de un usuario (búsqueda binaria sobre user_id)
+        """
+        user_id = self.user_index[username]
+        return slice(int(np.searchsorted(self.user_id, user_id, "left")),
+                     int(np.searchsorted(self.user_id, user_id, "right")))
+
+    def liters_by_user(self):
+        """
+        Devuelve los litros acumulados de cada usuario {usuario: litros}
+        """
+        totals = np.bincount(self.user_id, weights=self.liters(), minlength=len(self.users))
+        return dict(zip(self.users, totals.tolist()))
+
+    def liters_by_activity(self):
+        """
+        Devuelve los litros acumulados de todos los usuarios por actividad
+        """
+        totals = np.bincount(self.activity_id, weights=self.liters(),
+                             minlength=len(self.activities))
+        return dict(zip(self.activities, totals.tolist()))
+
+    def liters_by_city(self):
+        """
+        Devuelve los litros acumulados de todos los usuarios por ciudad
+        """
+        city_names = sorted(set(self.cities))
+        city_index = {city: i for i, city in enumerate(city_names)}
+        city_of_user = np.array([city_index[city] for city in self.cities], dtype=np.int32)
+        totals = np.bincount(city_of_user[self.user_id], weights=self.liters(),
+                             minlength=len(city_names))
+        return dict(zip(city_names, totals.tolist()))
+
+    def liters_by_day(self):
+        """
+        Devuelve los litros de todos los usuarios por fecha {fecha: litros}
+        """
+        if not len(self):
+            return {}
+        first_day = int(self.day.min())
+        offsets = self.day - first_day
+        totals = np.bincount(offsets, weights=self.liters())
+        days = np.flatnonzero(np.bincount(offsets))
+        dates = (days + first_day).astype("datetime64[D]").astype(str)
+        return dict(zip(dates.tolist(), totals[days].tolist()))
+
+    def daily_totals(self, username):
+        """
+        Devuelve los litros por día de un usuario {fecha: litros}
+        """
+        rows = self.user_rows(username)
+        days, inverse = np.unique(self.day[rows], return_inverse=True)
+        totals = np.bincount(inverse, weights=self.liters(rows), minlength=len(days))
+        dates = days.astype("datetime64[D]").astype(str)
+        return dict(zip(dates.tolist(), totals.tolist()))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] != "convert":
+        print("Uso: python columnar.py convert <user_data.json|h2omiga.db> <directorio>")
+        sys.exit(1)
+    source = sys.argv[2]
+    backend = "sqlite" if source.endswith(".db") else "json"
+    rows = convert(create_storage(backend, source).load_all(), sys.argv[3])
+    print(f"{rows} filas escritas en {sys.argv[3]}")
@@ -0,0 +1,176 @@
+# Cálculos de consumo sobre el registro de un usuario
+#
+# Cada registro guarda, además del detalle de actividades por día, los
+# totales en litros ya calculados:
+#   "daily_totals": {fecha: litros}
+#   "total_liters": litros acumulados de todo el historial
+# Se actualizan al registrar consumo, de modo que las consultas semanales,
+# mensuales o totales no recorren el historial completo.
+
+from datetime import datetime, timedelta
+
+from data import water_activities, water_rates, DEFAULT_WATER_RATE
+
+# Límite diario recomendado (litros por persona)
+DAILY_LIMIT = 100
+
+
+def day_liters(activities):
+    """
+    Calcula los litros de un conjunto de actividades {actividad: cantidad}
+    """
+    return sum(water_activities[activity]["liters"] * quantity
+               for activity, quantity in activities.items() if quantity > 0)
+
+
+def daily_totals(record):
+    """
+    Devuelve los litros por día de un usuario
+
+    Los registros anteriores a los totales precalculados se calculan a
+    partir del detalle de actividades sin modificar el registro.
+    """
+    if "daily_totals" in record:
+        return record["daily_totals"]
+    # numpy sólo se importa si hace falta recalcular un registro antiguo
+    from consumption_matrix import ConsumptionMatrix
+    return ConsumptionMatrix.from_record(record).daily_totals()
+
+
+def total_liters(record):
+    """
+    Devuelve los litros acumulados de todo el historial de un usuario
+    """
+    if "total_liters" in record:
+        return record["total_liters"]
+    return sum(daily_totals(record).values())
+
+
+def ensure_daily_totals(record):
+    """
+    Añade al registro los totales precalculados si aún no los tiene
+    """
+    if "daily_totals" not in record:
+        record["daily_totals"] = daily_totals(record)
+        record["total_liters"] = sum(record["daily_totals"].values())
+    return record["daily_totals"]
+
+
+def add_consumption(record, date, activities):
+    """
+    Suma actividades al consumo de un día y actualiza los totales
+
+    Args:
+        record: Registro del usuario (se modifica)
+        date: Fecha en formato YYYY-MM-DD
+        activities: Dict {actividad: cantidad}
+
+    Returns:
+        Litros añadidos
+    """
+    totals = ensure_daily_totals(record)
+    day = record["consumption"].setdefault(date, {})
+
+    for activity, quantity in activities.items():
+        if quantity > 0:
+            day[activity] = day.get(activity, 0) + quantity
+
+    liters = day_liters(activities)
+    totals[date] = totals.get(date, 0) + liters
+    record["total_liters"] = record.get("total_liters", 0) + liters
+    return liters
+
+
+def set_day_consumption(record, date, activities):
+    """
+    Reemplaza el consumo de un día y actualiza los totales
+
+    Args:
+        record: Registro del usuario (se modifica)
+        date: Fecha en formato YYYY-MM-DD
+        activities: Dict {actividad: cantidad}
+
+    Returns:
+        Litros del día tras el reemplazo
+    """
+    totals = ensure_daily_totals(record)
+    record["consumption"][date] = {activity: quantity
+                                   for activity, quantity in activities.items() if quantity > 0}
+
+    liters = day_liters(activities)
+    record["total_liters"] = record.get("total_liters", 0) - totals.get(date, 0) + liters
+    totals[date] = liters
+    return liters
+
+
+def last_days(record, days, today=None):
+    """
+    Devuelve el consumo de los últimos días, del más antiguo al más reciente
+
+    Args:
+        record: Registro del usuario
+        days: Número de días
+        today: Fecha final (por defecto hoy)
+
+    Returns:
+        Dict {fecha: litros} con un valor (0 si no hay datos) para cada día
+    """
+    totals = daily_totals(record)
+    today = today or datetime.now().date()
+    dates = [(today - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days - 1, -1, -1)]
+    return {date: totals.get(date, 0) for date in dates}
+
+
+def activity_shares(record, days, today=None):
+    """
+    Calcula qué fracción de los litros de los últimos días corresponde a cada actividad
+
+    Args:
+        record: Registro del usuario
+        days: Número de días
+        today: Fecha final (por defecto hoy)
+
+    Returns:
+        Dict {actividad: fracción entre 0 y 1}, vacío si no hay consumo en el periodo
+
+    Sólo cuentan las actividades que consumen agua: las de litros negativos
+    (p. ej. reparar una fuga) no reducen el total sobre el que se reparte.
+    """
+    # numpy sólo se importa al pedir las fracciones
+    from consumption_matrix import ConsumptionMatrix
+
+    consumption = record.get("consumption", {})
+    today = today or datetime.now().date()
+    dates = [(today - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days)]
+    period = ConsumptionMatrix.from_consumption({date: consumption[date] for date in dates
+                                                 if date in consumption})
+    liters = {activity: value for activity, value in period.activity_breakdown().items() if value > 0}
+    total = sum(liters.values())
+    return {activity: value / total for activity, value in liters.items()} if total else {}
+
+
+def usage_summary(record, days, today=None):
+    """
+    Resume el consumo de un usuario en los últimos días
+
+    Args:
+        record: Registro del usuario
+        days: Número de días del periodo
+        today: Fecha final (por defecto hoy)
+
+    Returns:
+        Dict con litros por día, total, promedio diario, días sobre el
+        límite, tarifa aplicada y costo en soles del periodo
+    """
+    period = last_days(record, days, today)
+    total = sum(period.values())
+    rate = water_rates.get(record.get("city", "Lima"), DEFAULT_WATER_RATE)
+
+    return {
+        "days": period,
+        "total_liters": total,
+        "daily_average": total / days,
+        "days_over_limit": sum(1 for liters in period.values() if liters > DAILY_LIMIT),
+        "rate": rate,
+        "cost": (total / 1000) * rate,
+    }
@@ -0,0 +1,101 @@
+# Motor matricial para agregar historiales de consumo
+#
+# Cada actividad de water_activities ocupa una columna fija, y el historial
+# de un usuario se guarda como una matriz densa días x actividades con las
+# cantidades registradas. Los litros se obtienen con un único producto
+# matriz-vector contra el vector de litros por uso.
+#
+# Se usa para recalcular los totales diarios de registros antiguos
+# (consumption.daily_totals), para el desglose por actividad de
+# consumption.activity_shares y en el simulador de ahorro.
+
+import numpy as np
+
+from data import water_activities
+
+ACTIVITY_KEYS = list(water_activities)
+ACTIVITY_INDEX = {activity: i for i, activity in enumerate(ACTIVITY_KEYS)}
+LITERS_VECTOR = np.array([water_activities[activity]["liters"] for activity in ACTIVITY_KEYS])
+
+
+def _to_day(date):
+    return np.datetime64(date, "D")
+
+
+class ConsumptionMatrix:
+    """
+    Historial de consumo como matriz días x actividades.
+
+    Attributes:
+        dates: Fechas con registros, ordenadas (datetime64[D])
+        counts: Cantidades por día y actividad (len(dates) x len(ACTIVITY_KEYS))
+    """
+
+    def __init__(self, dates, counts):
+        self.dates = dates
+        self.counts = counts
+
+    @classmethod
+    def from_consumption(cls, consumption):
+        """
+        Construye la matriz a partir del detalle {fecha: {actividad: cantidad}}
+        """
+        dates = sorted(consumption)
+        counts = np.zeros((len(dates), len(ACTIVITY_KEYS)), dtype=np.int64)
+
+        for row, date in enumerate(dates):
+            for activity, quantity in consumption[date].items():
+                counts[row, ACTIVITY_INDEX[activity]] = quantity
+
+        return cls(np.array(dates, dtype="datetime64[D]"), counts)
+
+    @classmethod
+    def from_record(cls, record):
+        """
+        Construye la matriz a partir del registro de un usuario
+        """
+        return cls.from_consumption(record.get("consumption", {}))
+
+    def __len__(self):
+        return len(self.dates)
+
+    def _rows(self, start=None, end=None):
+        """
+        Devuelve el rango de filas [inicio, fin) de las fechas entre start y end (incluidas)
+        """
+        first = 0 if start is None else int(np.searchsorted(self.dates, _to_day(start), "left"))
+        last = len(self.dates) if end is None else int(np.searchsorted(self.dates, _to_day(end), "right"))
+        return first, last
+
+    def daily_liters(self):
+        """
+        Devuelve los litros de cada día como vector
+        """
+        return self.counts @ LITERS_VECTOR
+
+    def daily_totals(self):
+        """
+        Devuelve los litros por día como dict {fecha: litros}
+        """
+        return dict(zip(self.dates.astype(str).tolist(), self.daily_liters().tolist()))
+
+    def activity_liters(self):
+        """
+        Devuelve los litros por día y actividad (días x actividades)
+        """
+        return self.counts * LITERS_VECTOR
+
+    def activity_breakdown(self, start=None, end=None):
+        """
+        Devuelve los litros por actividad entre dos fechas (incluidas)
+
+        Args:
+            start: Fecha inicial (por defecto el primer registro)
+            end: Fecha final (por defecto el último registro)
+
+        Returns:
+            Dict {actividad: litros} con las actividades que tienen consumo
+        """
+        first, last = self._rows(start, end)
+        liters = self.counts[first:last].sum(axis=0) * LITERS_VECTOR
+        return {ACTIVITY_KEYS[i]: float(liters[i]) for i in np.flatnonzero(liters)}
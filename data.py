@@ -163,141 +163,193 @@ city_avg_consumption = {
 # Consumo promedio nacional
 NATIONAL_AVG_CONSUMPTION = 145  # litros por persona por día
 
-# Huella hídrica de alimentos comunes (litros por kg o litro)
+# Periodos en que se indican las cantidades de la huella hídrica (días de cada uno)
+FOOTPRINT_PERIOD_DAYS = {"day": 1, "week": 7, "month": 30, "year": 365}
+
+# Categorías de alimentos, en el orden en que se muestran
+FOOD_CATEGORIES = ["Carnes", "Lácteos y huevos", "Cereales", "Vegetales", "Frutas", "Bebidas", "Otros"]
+
+# Huella hídrica de alimentos comunes (litros por kg o litro, cantidades por semana)
 food_water_footprint = {
     "carne_res": {
         "name": "Carne de res",
         "water_footprint": 15400,
-        "unit": "litros/kg"
+        "unit": "litros/kg",
+        "category": "Carnes",
+        "period": "week"
     },
     "carne_pollo": {
         "name": "Carne de pollo",
         "water_footprint": 4325,
-        "unit": "litros/kg"
+        "unit": "litros/kg",
+        "category": "Carnes",
+        "period": "week"
     },
     "carne_cerdo": {
         "name": "Carne de cerdo",
         "water_footprint": 5988,
-        "unit": "litros/kg"
+        "unit": "litros/kg",
+        "category": "Carnes",
+        "period": "week"
     },
     "arroz": {
         "name": "Arroz",
         "water_footprint": 3400,
-        "unit": "litros/kg"
+        "unit": "litros/kg",
+        "category": "Cereales",
+        "period": "week"
     },
     "papa": {
         "name": "Papa",
         "water_footprint": 290,
-        "unit": "litros/kg"
+        "unit": "litros/kg",
+        "category": "Vegetales",
+        "period": "week"
     },
     "maiz": {
         "name": "Maíz",
         "water_footprint": 1222,
-        "unit": "litros/kg"
+        "unit": "litros/kg",
+        "category": "Cereales",
+        "period": "week"
     },
     "trigo": {
         "name": "Pan/Trigo",
         "water_footprint": 1608,
-        "unit": "litros/kg"
+        "unit": "litros/kg",
+        "category": "Cereales",
+        "period": "week"
     },
     "leche": {
         "name": "Leche",
         "water_footprint": 1020,
-        "unit": "litros/litro"
+        "unit": "litros/litro",
+        "category": "Lácteos y huevos",
+        "period": "week"
     },
     "queso": {
         "name": "Queso",
         "water_footprint": 5060,
-        "unit": "litros/kg"
+        "unit": "litros/kg",
+        "category": "Lácteos y huevos",
+        "period": "week"
     },
     "huevos": {
         "name": "Huevos",
         "water_footprint": 3300,
-        "unit": "litros/kg"
+        "unit": "litros/kg",
+        "category": "Lácteos y huevos",
+        "period": "week"
     },
     "tomate": {
         "name": "Tomate",
         "water_footprint": 214,
-        "unit": "litros/kg"
+        "unit": "litros/kg",
+        "category": "Vegetales",
+        "period": "week"
     },
     "lechuga": {
         "name": "Lechuga",
         "water_footprint": 237,
-        "unit": "litros/kg"
+        "unit": "litros/kg",
+        "category": "Vegetales",
+        "period": "week"
     },
     "manzana": {
         "name": "Manzana",
         "water_footprint": 822,
-        "unit": "litros/kg"
+        "unit": "litros/kg",
+        "category": "Frutas",
+        "period": "week"
     },
     "platano": {
         "name": "Plátano/Banana",
         "water_footprint": 790,
-        "unit": "litros/kg"
+        "unit": "litros/kg",
+        "category": "Frutas",
+        "period": "week"
     },
     "cafe": {
         "name": "Café",
         "water_footprint": 18900,
-        "unit": "litros/kg"
+        "unit": "litros/kg",
+        "category": "Bebidas",
+        "period": "week"
     },
     "chocolate": {
         "name": "Chocolate",
         "water_footprint": 17196,
-        "unit": "litros/kg"
+        "unit": "litros/kg",
+        "category": "Otros",
+        "period": "week"
     },
     "azucar": {
         "name": "Azúcar",
         "water_footprint": 1782,
-        "unit": "litros/kg"
+        "unit": "litros/kg",
+        "category": "Otros",
+        "period": "week"
     },
     "aceite_oliva": {
         "name": "Aceite de oliva",
         "water_footprint": 14431,
-        "unit": "litros/litro"
+        "unit": "litros/litro",
+        "category": "Otros",
+        "period": "week"
     },
     "cerveza": {
         "name": "Cerveza",
         "water_footprint": 298,
-        "unit": "litros/litro"
+        "unit": "litros/litro",
+        "category": "Bebidas",
+        "period": "week"
     },
     "vino": {
         "name": "Vino",
         "water_footprint": 869,
-        "unit": "litros/litro"
+        "unit": "litros/litro",
+        "category": "Bebidas",
+        "period": "week"
     }
 }
 
-# Huella hídrica de productos comunes (litros por unidad)
+# Huella hídrica de productos comunes (litros por unidad; "period" es el periodo en que se indica la cantidad)
 product_water_footprint = {
     "camiseta_algodon": {
         "name": "Camiseta de algodón",
         "water_footprint": 2700,
-        "unit": "litros/unidad"
+        "unit": "litros/unidad",
+        "period": "month"
     },
     "jeans": {
         "name": "Jeans/pantalón",
         "water_footprint": 8000,
-        "unit": "litros/unidad"
+        "unit": "litros/unidad",
+        "period": "month"
     },
     "zapatos_cuero": {
         "name": "Zapatos de cuero",
         "water_footprint": 8000,
-        "unit": "litros/par"
+        "unit": "litros/par",
+        "period": "month"
     },
     "papel": {
         "name": "Papel (hoja A4)",
         "water_footprint": 10,
-        "unit": "litros/hoja"
+        "unit": "litros/hoja",
+        "period": "day"
     },
     "smartphone": {
         "name": "Smartphone",
         "water_footprint": 13000,
-        "unit": "litros/unidad"
+        "unit": "litros/unidad",
+        "period": "year"
     },
     "computadora": {
         "name": "Computadora/Laptop",
         "water_footprint": 20000,
-        "unit": "litros/unidad"
+        "unit": "litros/unidad",
+        "period": "year"
     }
 }
 
@@ -0,0 +1,201 @@
+# Exportación del historial de consumo por bloques
+#
+# Las filas se generan una a una a partir del registro del usuario y cada
+# formato (CSV, NDJSON o Parquet) se escribe en bloques de tamaño acotado,
+# sin construir listas ni DataFrames con todo el historial. El resultado se
+# guarda en una caché indexada por el usuario y la versión de su historial
+# (litros acumulados y número de días), de modo que descargar de nuevo datos
+# que no han cambiado no vuelve a generarlos ni a recorrerlos.
+#
+# Uso: python exporter.py <usuario> <archivo> [--format csv|ndjson|parquet]
+
+import argparse
+import csv
+import io
+import json
+
+from cache import SizedLRUCache
+from consumption import daily_totals, total_liters
+from data import water_activities
+from profiling import profiled
+from storage import get_storage
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet es opcional
+    pa = pq = None
+
+EXPORT_COLUMNS = ["Fecha", "Actividad", "Cantidad", "Litros"]
+DEFAULT_CHUNK_ROWS = 1000
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+def iter_export_rows(record):
+    """
+    Genera las filas de exportación de un usuario
+
+    Yields:
+        Dict con las columnas Fecha, Actividad, Cantidad y Litros
+    """
+    for date, activities in record.get("consumption", {}).items():
+        for activity, quantity in activities.items():
+            yield {
+                "Fecha": date,
+                "Actividad": water_activities[activity]["name"],
+                "Cantidad": quantity,
+                "Litros": water_activities[activity]["liters"] * quantity
+            }
+
+
+def _chunked(rows, chunk_rows):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_csv(rows, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Escribe las filas como CSV, devolviendo bloques de bytes
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, lineterminator="\n")
+    writer.writeheader()
+    for chunk in _chunked(rows, chunk_rows):
+        writer.writerows(chunk)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def iter_ndjson(rows, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Escribe las filas como JSON delimitado por saltos de línea (NDJSON)
+    """
+    for chunk in _chunked(rows, chunk_rows):
+        yield "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in chunk).encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Destino de escritura que entrega lo escrito por partes sin perder la posición
+    """
+
+    def __init__(self):
+        self.position = 0
+        self.parts = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data = b"".join(self.parts)
+        self.parts = []
+        return data
+
+
+def iter_parquet(rows, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Escribe las filas como Parquet, un grupo de filas por bloque (requiere pyarrow)
+    """
+    if pq is None:
+        raise RuntimeError("La exportación a Parquet requiere instalar pyarrow")
+
+    schema = pa.schema([
+        ("Fecha", pa.string()),
+        ("Actividad", pa.string()),
+        ("Cantidad", pa.int64()),
+        ("Litros", pa.float64()),
+    ])
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for chunk in _chunked(rows, chunk_rows):
+            writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+# Formatos disponibles: nombre -> (escritor, tipo MIME, extensión)
+EXPORT_FORMATS = {
+    "csv": (iter_csv, "text/csv", "csv"),
+    "ndjson": (iter_ndjson, "application/x-ndjson", "ndjson"),
+}
+if pq is not None:
+    EXPORT_FORMATS["parquet"] = (iter_parquet, "application/vnd.apache.parquet", "parquet")
+
+
+def iter_export(record, export_format="csv", chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Genera la exportación de un usuario como bloques de bytes
+    """
+    writer = EXPORT_FORMATS[export_format][0]
+    return writer(iter_export_rows(record), chunk_rows)
+
+
+def export_key(username, record, export_format):
+    """
+    Devuelve la clave de caché de una exportación
+
+    En lugar de recorrer el historial se usa un sello de su versión que
+    cambia con cada registro o importación: litros acumulados y número de días.
+    """
+    return (username, export_format, total_liters(record), len(daily_totals(record)))
+
+
+# Exportaciones ya generadas, indexadas por usuario, formato y versión del historial
+_export_cache = SizedLRUCache(CACHE_MAX_BYTES)
+
+
+@profiled
+def export_bytes(username, record, export_format="csv"):
+    """
+    Devuelve la exportación completa de un usuario, reutilizando la caché
+
+    Args:
+        username: Nombre del usuario
+        record: Registro del usuario
+        export_format: "csv", "ndjson" o "parquet"
+
+    Returns:
+        Bytes del archivo exportado
+    """
+    key = export_key(username, record, export_format)
+    data = _export_cache.get(key)
+    if data is None:
+        data = b"".join(iter_export(record, export_format))
+        _export_cache.put(key, data)
+    return data
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exporta el historial de consumo de un usuario")
+    parser.add_argument("username", help="Nombre del usuario")
+    parser.add_argument("output", help="Archivo de salida")
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="csv")
+    args = parser.parse_args()
+
+    record = get_storage().get_user(args.username)
+    if record is None:
+        print(f"El usuario '{args.username}' no existe")
+        raise SystemExit(1)
+
+    # Escritura directa al archivo, bloque a bloque
+    with open(args.output, 'wb') as f:
+        for block in iter_export(record, args.format):
+            f.write(block)
+    print(f"Datos de {args.username} exportados a {args.output}")
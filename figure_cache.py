@@ -0,0 +1,46 @@
+# Caché de figuras de Plotly indexada por el hash de sus datos
+#
+# Los gráficos del tablero se construyen con funciones puras que reciben
+# sólo los datos que muestran. cached_figure() calcula un hash de esos datos
+# y, si la figura ya se construyó (en esta o en otra sesión), la reutiliza
+# sin volver a crear el DataFrame ni la figura. Las figuras guardadas son
+# compartidas: no deben modificarse después de obtenerlas.
+
+import hashlib
+import json
+
+from cache import SizedLRUCache
+from profiling import profiled
+
+FIGURE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+_figure_cache = SizedLRUCache(FIGURE_CACHE_MAX_BYTES)
+
+
+def figure_key(build, inputs):
+    """
+    Calcula la clave de una figura a partir de su constructor y sus datos
+    """
+    payload = json.dumps([build.__module__, build.__qualname__, inputs], default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@profiled
+def cached_figure(build, *inputs):
+    """
+    Devuelve la figura build(*inputs), construyéndola sólo si sus datos cambiaron
+
+    Args:
+        build: Función que construye la figura a partir de los datos
+        *inputs: Datos del gráfico (serializables como JSON)
+
+    Returns:
+        Figura de Plotly (de sólo lectura)
+    """
+    key = figure_key(build, inputs)
+    figure = _figure_cache.get(key)
+    if figure is None:
+        figure = build(*inputs)
+        # El tamaño de la figura se estima por su representación JSON
+        _figure_cache.put(key, figure, len(figure.to_json()))
+    return figure
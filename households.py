@@ -0,0 +1,220 @@
+# Hogares: cuentas que agrupan a los usuarios de una misma conexión de agua
+#
+# La facturación es por conexión, así que cada hogar guarda sus propios
+# totales ya agregados, con la misma forma que el registro de un usuario:
+#   "daily_totals": {fecha: litros}
+#   "monthly_totals": {YYYY-MM: litros}
+#   "total_liters": litros acumulados
+# Al registrar consumo sólo se suma la diferencia del día del miembro, de modo
+# que mostrar los totales del hogar no recorre el historial de sus miembros.
+# Los totales se recalculan desde cero (rebuild_household) cuando entra o
+# sale un miembro.
+#
+# Los miembros son los usuarios cuyo campo "household" apunta al hogar: entrar
+# o salir es una sola escritura del usuario. La suma de la diferencia al hogar
+# es una escritura aparte, así que una carrera con una entrada o salida, un
+# fallo o una interrupción entre ambas pueden dejar los totales desfasados.
+# Por eso household_summary compara los miembros y el total del hogar con
+# los de sus usuarios y, si no coinciden, lo recalcula.
+#
+# Al tener la misma forma que un usuario, last_days, usage_summary y las
+# tarifas de water_rates funcionan igual sobre un hogar.
+
+import logging
+import math
+
+from consumption import daily_totals, usage_summary
+from storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+
+def new_household_record(city):
+    """
+    Devuelve el registro vacío de un hogar nuevo
+    """
+    return {
+        "city": city,
+        "members": [],
+        "daily_totals": {},
+        "monthly_totals": {},
+        "total_liters": 0
+    }
+
+
+def _add_liters(household, date, liters):
+    totals = household["daily_totals"]
+    totals[date] = totals.get(date, 0) + liters
+    month = date[:7]
+    household["monthly_totals"][month] = household["monthly_totals"].get(month, 0) + liters
+    household["total_liters"] += liters
+
+
+def create_household(name, city):
+    """
+    Crea un hogar vacío
+
+    Raises:
+        ValueError: Si ya existe un hogar con ese nombre
+    """
+    name = name.strip()
+    if not name:
+        raise ValueError("El nombre del hogar no puede estar vacío")
+
+    def update(household):
+        if household is not None:
+            raise ValueError(f"Ya existe un hogar llamado '{name}'")
+        return new_household_record(city)
+
+    get_storage().update_household(name, update)
+    return name
+
+
+def add_member_consumption(name, username, deltas):
+    """
+    Suma al hogar los litros que un miembro acaba de registrar
+
+    El consumo del miembro ya está guardado, así que un fallo aquí no se
+    propaga: se registra en el log y household_summary repara los totales.
+
+    Args:
+        name: Nombre del hogar
+        username: Miembro que registró el consumo
+        deltas: Dict {fecha: litros añadidos (o quitados, si son negativos)}
+
+    Returns:
+        El hogar actualizado, o None si no se modificó
+    """
+    def update(household):
+        # Si el usuario salió del hogar mientras tanto, el recálculo ya no lo cuenta
+        if household is None or username not in household["members"]:
+            return None
+        for date, liters in deltas.items():
+            if liters:
+                _add_liters(household, date, liters)
+        return household
+
+    try:
+        return get_storage().update_household(name, update)
+    except Exception:
+        logger.exception("No se pudo sumar el consumo de '%s' al hogar '%s'", username, name)
+        return None
+
+
+def rebuild_household(name):
+    """
+    Recalcula los miembros y los totales del hogar a partir de sus usuarios
+    """
+    storage = get_storage()
+
+    def update(household):
+        if household is None:
+            raise ValueError(f"El hogar '{name}' no existe")
+        household.update(members=sorted(storage.household_member_totals(name)),
+                         daily_totals={}, monthly_totals={}, total_liters=0)
+        for username in household["members"]:
+            member = storage.get_user(username)
+            if member is None:
+                continue
+            for date, liters in daily_totals(member).items():
+                _add_liters(household, date, liters)
+        return household
+
+    return storage.update_household(name, update)
+
+
+def _set_household(username, name):
+    """
+    Cambia el hogar de un usuario (None para quitarlo) y recalcula los afectados
+
+    Returns:
+        Nombre del hogar anterior, o None si no tenía
+    """
+    storage = get_storage()
+    previous = []
+
+    def update(user):
+        if user is None:
+            if name is not None:
+                raise ValueError(f"El usuario '{username}' no existe")
+            user = {}
+        previous.append(user.get("household"))
+        if user.get("household") == name:
+            return None
+        if name is None:
+            user.pop("household", None)
+        else:
+            user["household"] = name
+        return user
+
+    storage.update_user(username, update)
+    for household in {previous[-1], name} - {None}:
+        if storage.get_household(household) is not None:
+            rebuild_household(household)
+    return previous[-1]
+
+
+def join_household(username, name):
+    """
+    Añade un usuario a un hogar (saliendo del anterior, si tenía uno)
+
+    Returns:
+        Nombre del hogar anterior, o None si no tenía
+    """
+    if get_storage().get_household(name) is None:
+        raise ValueError(f"El hogar '{name}' no existe")
+    return _set_household(username, name)
+
+
+def leave_household(username):
+    """
+    Quita a un usuario de su hogar
+
+    Returns:
+        Nombre del hogar que deja, o None si no tenía
+    """
+    return _set_household(username, None)
+
+
+def get_household(name):
+    return get_storage().get_household(name)
+
+
+def list_households():
+    return get_storage().list_households()
+
+
+def _is_consistent(name, household):
+    """
+    Comprueba que los miembros y el total del hogar coinciden con los de sus usuarios
+    """
+    members = get_storage().household_member_totals(name)
+    return (sorted(members) == sorted(household["members"])
+            and math.isclose(sum(members.values()), household["total_liters"],
+                             rel_tol=1e-9, abs_tol=1e-6))
+
+
+def household_summary(name, days=30):
+    """
+    Resume el consumo y el costo del hogar en los últimos días (ver usage_summary)
+
+    Si los totales guardados no coinciden con los de sus miembros, primero
+    se recalculan.
+
+    Returns:
+        Dict de usage_summary con además el nombre, los miembros y el
+        consumo mensual del hogar, o None si el hogar no existe
+    """
+    household = get_household(name)
+    if household is None:
+        return None
+    if not _is_consistent(name, household):
+        household = rebuild_household(name)
+    summary = usage_summary(household, days)
+    summary.update(
+        name=name,
+        city=household["city"],
+        members=household["members"],
+        monthly_totals=household["monthly_totals"],
+    )
+    return summary
@@ -0,0 +1,98 @@
+# Presupuesto de tiempo de importación de las pantallas
+#
+# Mide, en un intérprete nuevo y después de importar streamlit, cuánto
+# tardan en importarse los módulos de cada pantalla y qué bibliotecas
+# pesadas arrastran. La introducción es lo primero que ve el usuario, por
+# lo que debe cargarse dentro del presupuesto y sin pandas, plotly, numpy
+# ni el almacenamiento.
+#
+# Uso: python import_budget.py [--budget-ms 50] [--detail]
+# (--detail muestra la salida de python -X importtime de la introducción)
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+DEFAULT_BUDGET_MS = 50
+
+# Módulos que necesita cada pantalla además de app.py
+SCREEN_MODULES = {
+    "intro": ["views.intro"],
+    "register": ["views.register"],
+    "welcome": ["views.welcome"],
+    "dashboard": ["views.dashboard", "views.tabs.register"],
+}
+
+# Módulos que la introducción no debe importar
+INTRO_FORBIDDEN = ["pandas", "plotly.express", "plotly.graph_objects", "numpy", "pyarrow", "storage"]
+
+_MEASURE = """
+import json, sys, time
+import streamlit
+before = set(sys.modules)
+start = time.perf_counter()
+for name in sys.argv[1:]:
+    __import__(name)
+elapsed = time.perf_counter() - start
+print(json.dumps({"ms": elapsed * 1000, "modules": sorted(set(sys.modules) - before)}))
+"""
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def measure(modules):
+    """
+    Importa módulos en un intérprete nuevo (con streamlit ya cargado)
+
+    Returns:
+        Dict con los milisegundos de importación y los módulos nuevos
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", _MEASURE, *modules],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def importtime_detail(modules):
+    """
+    Devuelve la salida de python -X importtime para los módulos indicados
+    """
+    code = "import streamlit\n" + "".join(f"import {name}\n" for name in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return result.stderr
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Comprueba el tiempo de importación de las pantallas")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="Tiempo máximo de importación de la introducción (ms)")
+    parser.add_argument("--detail", action="store_true",
+                        help="Mostrar el detalle de python -X importtime de la introducción")
+    args = parser.parse_args()
+
+    results = {screen: measure(modules) for screen, modules in SCREEN_MODULES.items()}
+    for screen, result in results.items():
+        print(f"{screen:<10} {result['ms']:8.1f} ms  {len(result['modules'])} módulos")
+
+    if args.detail:
+        print(importtime_detail(SCREEN_MODULES["intro"]))
+
+    intro = results["intro"]
+    heavy = [name for name in INTRO_FORBIDDEN if name in intro["modules"]]
+    failed = False
+    if heavy:
+        print(f"La introducción importa módulos pesados: {', '.join(heavy)}")
+        failed = True
+    if intro["ms"] > args.budget_ms:
+        print(f"La introducción supera el presupuesto: {intro['ms']:.1f} ms > {args.budget_ms:.0f} ms")
+        failed = True
+
+    if failed:
+        sys.exit(1)
+    print(f"Introducción dentro del presupuesto ({intro['ms']:.1f} ms <= {args.budget_ms:.0f} ms)")
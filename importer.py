@@ -0,0 +1,203 @@
+# Importación masiva de consumo histórico desde CSV
+#
+# Lee el mismo formato que genera "Exportar datos" (Fecha, Actividad,
+# Cantidad y, opcionalmente, Litros, que se ignora y se recalcula). El
+# archivo se procesa por bloques de filas, de modo que sólo se mantiene en
+# memoria el consumo agregado por día, y todo se aplica con una única
+# escritura del usuario.
+#
+# Uso: python importer.py <usuario> <archivo.csv> [--city Lima] [--replace] [--skip-invalid]
+# (si el usuario no existe, --city indica la ciudad con la que se crea)
+
+import argparse
+import csv
+import io
+from datetime import datetime
+
+from city_stats import get_city_stats
+from consumption import add_consumption, daily_totals, set_day_consumption
+from data import water_activities
+from households import add_member_consumption
+from storage import get_storage, new_user_record
+
+REQUIRED_COLUMNS = ("Fecha", "Actividad", "Cantidad")
+DEFAULT_CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 100
+
+# La columna Actividad puede traer el nombre visible o la clave de la actividad
+ACTIVITY_BY_NAME = {details["name"].casefold(): activity
+                    for activity, details in water_activities.items()}
+ACTIVITY_BY_NAME.update({activity.casefold(): activity for activity in water_activities})
+
+
+class ImportResult:
+    """
+    Resumen de una importación
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.days = 0
+        self.errors = []
+        self.error_count = 0
+        self.consumption = {}
+
+    def add_error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"Línea {line}: {message}")
+
+
+def parse_row(row):
+    """
+    Valida una fila del CSV
+
+    Returns:
+        Tupla (fecha, actividad, cantidad)
+
+    Raises:
+        ValueError: Si la fila no es válida
+    """
+    try:
+        date = datetime.strptime(row["Fecha"].strip(), "%Y-%m-%d").strftime("%Y-%m-%d")
+    except (AttributeError, ValueError):
+        raise ValueError(f"fecha inválida '{row['Fecha']}' (se espera AAAA-MM-DD)")
+
+    activity = ACTIVITY_BY_NAME.get((row["Actividad"] or "").strip().casefold())
+    if activity is None:
+        raise ValueError(f"actividad desconocida '{row['Actividad']}'")
+
+    try:
+        quantity = float(row["Cantidad"])
+    except (TypeError, ValueError):
+        raise ValueError(f"cantidad inválida '{row['Cantidad']}'")
+    if quantity < 0 or not quantity.is_integer():
+        raise ValueError(f"la cantidad debe ser un entero no negativo, no '{row['Cantidad']}'")
+
+    return date, activity, int(quantity)
+
+
+def iter_chunks(text_file, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Recorre el CSV por bloques de filas
+
+    Yields:
+        Listas de (número de línea, fila) de hasta chunk_size elementos
+    """
+    reader = csv.DictReader(text_file)
+    missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"Faltan columnas en el CSV: {', '.join(missing)}")
+
+    chunk = []
+    for row in reader:
+        chunk.append((reader.line_num, row))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def read_consumption(text_file, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Lee y valida un CSV agregando las cantidades por día y actividad
+
+    Returns:
+        ImportResult con el consumo agregado {fecha: {actividad: cantidad}}
+    """
+    result = ImportResult()
+
+    for chunk in iter_chunks(text_file, chunk_size):
+        for line, row in chunk:
+            try:
+                date, activity, quantity = parse_row(row)
+            except ValueError as e:
+                result.add_error(line, str(e))
+                continue
+            day = result.consumption.setdefault(date, {})
+            day[activity] = day.get(activity, 0) + quantity
+            result.rows += 1
+
+    result.days = len(result.consumption)
+    return result
+
+
+def import_consumption(username, file, city=None, replace=False, skip_invalid=False,
+                       chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Importa el consumo histórico de un usuario desde un CSV
+
+    Args:
+        username: Nombre del usuario
+        file: Archivo CSV abierto (texto o binario UTF-8)
+        city: Ciudad para crear al usuario si no existe
+        replace: Si es True, los días del CSV reemplazan a los ya registrados;
+            si es False, las cantidades se suman
+        skip_invalid: Si es True, se importan las filas válidas aunque haya errores
+        chunk_size: Filas por bloque de lectura
+
+    Returns:
+        ImportResult; si hay errores y skip_invalid es False no se escribe nada
+    """
+    # Archivos binarios (p. ej. los de st.file_uploader) se decodifican al vuelo
+    if isinstance(file, (io.RawIOBase, io.BufferedIOBase)):
+        file = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+
+    result = read_consumption(file, chunk_size)
+
+    if (result.error_count and not skip_invalid) or not result.consumption:
+        return result
+
+    def update(user):
+        if user is None:
+            if city is None:
+                raise ValueError(f"El usuario '{username}' no existe")
+            user = new_user_record(city)
+        apply_day = set_day_consumption if replace else add_consumption
+        totals = daily_totals(user)
+        before = {date: totals.get(date, 0) for date in result.consumption}
+        for date in sorted(result.consumption):
+            apply_day(user, date, result.consumption[date])
+        after = daily_totals(user)
+        deltas.update({date: after.get(date, 0) - liters for date, liters in before.items()})
+        return user
+
+    deltas = {}
+    record = get_storage().update_user(username, update)
+    get_city_stats().update_record(username, record)
+
+    # Pasar al hogar sólo la diferencia de los días importados
+    if record.get("household"):
+        add_member_consumption(record["household"], username, deltas)
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Importa consumo histórico desde un CSV")
+    parser.add_argument("username", help="Nombre del usuario")
+    parser.add_argument("csv_path", help="Archivo CSV (Fecha, Actividad, Cantidad)")
+    parser.add_argument("--city", help="Ciudad para crear al usuario si no existe")
+    parser.add_argument("--replace", action="store_true",
+                        help="Reemplazar los días ya registrados en lugar de sumar")
+    parser.add_argument("--skip-invalid", action="store_true",
+                        help="Importar las filas válidas aunque haya errores")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    try:
+        with open(args.csv_path, 'r', encoding="utf-8-sig", newline="") as f:
+            result = import_consumption(args.username, f, city=args.city, replace=args.replace,
+                                        skip_invalid=args.skip_invalid, chunk_size=args.chunk_size)
+    except ValueError as e:
+        print(e)
+        raise SystemExit(1)
+
+    for error in result.errors:
+        print(error)
+    if result.error_count > len(result.errors):
+        print(f"... y {result.error_count - len(result.errors)} errores más")
+    if result.error_count and not args.skip_invalid:
+        print("No se importó nada. Corrige los errores o usa --skip-invalid.")
+        raise SystemExit(1)
+    print(f"{result.rows} filas importadas ({result.days} días) para {args.username}")
@@ -0,0 +1,264 @@
+# Métricas de operación en formato de texto de Prometheus
+#
+# Contadores, medidores e histogramas con etiquetas, compartidos por todo el
+# proceso. Se exponen de dos formas, según la configuración:
+#   H2OMIGA_METRICS_PORT=9108   servidor HTTP local en /metrics
+#   H2OMIGA_METRICS_FILE=ruta   archivo reescrito cada H2OMIGA_METRICS_INTERVAL
+#                               segundos (por defecto 15), p. ej. para el
+#                               textfile collector de node_exporter
+# No depende de bibliotecas externas.
+
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_INTERVAL = 15
+# Permisos del archivo de métricas (legible por el colector de node_exporter)
+FILE_MODE = 0o644
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+REGISTRY = []
+
+logger = logging.getLogger(__name__)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """
+    Métrica con etiquetas; cada combinación de valores es una serie
+    """
+
+    type = None
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._series = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"La métrica {self.name} usa las etiquetas {self.label_names}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        with self._lock:
+            series = list(self._series.items())
+        for key, value in series:
+            lines.extend(self._render_series(key, value))
+        return lines
+
+    def _render_series(self, key, value):
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"]
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = value
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._series.get(key, ([0] * len(self.buckets), 0.0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._series[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        Observa la duración en segundos del bloque
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _render_series(self, key, value):
+        counts, total = value
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            labels = _format_labels(self.label_names, key, [("le", _format_value(bound))])
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.label_names, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+# Métricas de la aplicación
+REGISTRATIONS = Counter("h2omiga_registrations_total",
+                        "Registros de consumo por ciudad", ["city"])
+ACTIVITY_USES = Counter("h2omiga_activity_uses_total",
+                        "Usos registrados de cada actividad por ciudad", ["activity", "city"])
+REGISTERED_LITERS = Counter("h2omiga_registered_liters_total",
+                            "Litros registrados por ciudad", ["city"])
+STORAGE_LATENCY = Histogram("h2omiga_storage_seconds",
+                            "Duración de las lecturas y escrituras del almacenamiento",
+                            ["backend", "operation"])
+STORAGE_FILE_BYTES = Gauge("h2omiga_storage_file_bytes",
+                           "Tamaño del archivo de datos", ["backend"])
+TIP_IMPRESSIONS = Counter("h2omiga_tip_impressions_total",
+                          "Consejos de ahorro mostrados", ["tip_id"])
+QUIZ_COMPLETIONS = Counter("h2omiga_quiz_completions_total",
+                           "Quizzes completados")
+QUIZ_SCORE = Histogram("h2omiga_quiz_score",
+                       "Respuestas correctas por quiz completado",
+                       buckets=range(0, 11))
+CHALLENGE_ACTIONS = Counter("h2omiga_challenge_actions_total",
+                            "Desafíos aceptados y completados", ["action"])
+WRITE_BEHIND_PENDING = Gauge("h2omiga_write_behind_pending_users",
+                             "Usuarios con modificaciones diferidas sin escribir")
+WRITE_BEHIND_FAILURES = Counter("h2omiga_write_behind_failures_total",
+                                "Escrituras diferidas fallidas (el lote vuelve a la cola)")
+RERUN_DURATION = Histogram("h2omiga_rerun_seconds",
+                           "Duración de cada ejecución del script por pantalla", ["screen"])
+
+
+def render():
+    """
+    Devuelve todas las métricas en formato de texto de Prometheus
+    """
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def _handler_class():
+    # http.server se importa sólo si se pide el servidor
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MetricsHandler
+
+
+def start_http_server(port, host="127.0.0.1"):
+    """
+    Sirve las métricas en http://host:port/metrics desde un hilo en segundo plano
+    """
+    from http.server import ThreadingHTTPServer
+    server = ThreadingHTTPServer((host, port), _handler_class())
+    threading.Thread(target=server.serve_forever, name="h2omiga-metrics", daemon=True).start()
+    return server
+
+
+def write_file(path):
+    """
+    Escribe las métricas en un archivo, reemplazándolo de forma atómica
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".metrics.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(render())
+        # mkstemp crea el archivo con permisos 0600: el colector de
+        # node_exporter suele correr con otro usuario y debe poder leerlo
+        os.chmod(tmp_path, FILE_MODE)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def start_file_writer(path, interval=DEFAULT_INTERVAL):
+    """
+    Reescribe el archivo de métricas periódicamente desde un hilo en segundo plano
+    """
+    def loop():
+        while True:
+            try:
+                write_file(path)
+            except Exception:
+                # Un fallo (disco lleno, directorio borrado...) no debe detener el hilo
+                logger.exception("No se pudo escribir el archivo de métricas %s", path)
+            time.sleep(interval)
+
+    threading.Thread(target=loop, name="h2omiga-metrics-file", daemon=True).start()
+
+
+_exporters_started = False
+_exporters_lock = threading.Lock()
+
+
+def start_exporters():
+    """
+    Inicia, una sola vez por proceso, los exportadores configurados por variables de entorno
+    """
+    global _exporters_started
+    if _exporters_started:
+        return
+    with _exporters_lock:
+        if _exporters_started:
+            return
+        _exporters_started = True
+        port = os.environ.get("H2OMIGA_METRICS_PORT")
+        if port:
+            start_http_server(int(port))
+        path = os.environ.get("H2OMIGA_METRICS_FILE")
+        if path:
+            start_file_writer(path, float(os.environ.get("H2OMIGA_METRICS_INTERVAL", DEFAULT_INTERVAL)))
@@ -0,0 +1,108 @@
+# Instrumentación de las funciones de acceso a datos (modo de depuración)
+#
+# Las funciones decoradas con @profiled cuentan sus llamadas y su tiempo
+# acumulado en el perfil de la ejecución actual del script, y el
+# almacenamiento suma los bytes leídos y escritos. El perfil es propio de
+# cada hilo (Streamlit ejecuta cada sesión en el suyo); sin perfil activo el
+# decorador sólo añade una consulta a threading.local.
+#
+# Se activa con H2OMIGA_PROFILE=1 o abriendo la aplicación con ?profile=1.
+
+import functools
+import os
+import threading
+import time
+
+_local = threading.local()
+
+
+class RerunProfile:
+    """
+    Llamadas, tiempo y bytes de entrada/salida de una ejecución del script
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.calls = {}  # nombre -> [llamadas, segundos]
+        self.bytes = {"read": 0, "written": 0}
+        self.events = {}  # nombre -> veces (p. ej. lecturas reales del archivo)
+
+    def record(self, name, seconds):
+        entry = self.calls.setdefault(name, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    def rows(self):
+        """
+        Devuelve las funciones medidas, de mayor a menor tiempo acumulado
+        """
+        return [
+            {"Función": name, "Llamadas": count, "Tiempo (ms)": round(seconds * 1000, 2)}
+            for name, (count, seconds) in sorted(self.calls.items(), key=lambda item: -item[1][1])
+        ]
+
+
+def profiling_requested(query_params=None):
+    """
+    Indica si el modo de depuración está activo (variable de entorno o ?profile=1)
+    """
+    if os.environ.get("H2OMIGA_PROFILE", "").lower() in ("1", "true", "yes"):
+        return True
+    return query_params is not None and query_params.get("profile") in ("1", "true")
+
+
+def start_rerun():
+    """
+    Empieza un perfil nuevo para la ejecución actual de este hilo
+    """
+    _local.profile = RerunProfile()
+    return _local.profile
+
+
+def stop_rerun():
+    _local.profile = None
+
+
+def current_profile():
+    return getattr(_local, "profile", None)
+
+
+def add_bytes(kind, count):
+    """
+    Suma bytes leídos ("read") o escritos ("written") al perfil actual
+    """
+    profile = getattr(_local, "profile", None)
+    if profile is not None:
+        profile.bytes[kind] += count
+
+
+def add_event(name):
+    """
+    Cuenta un evento (p. ej. una lectura real del archivo) en el perfil actual
+    """
+    profile = getattr(_local, "profile", None)
+    if profile is not None:
+        profile.events[name] = profile.events.get(name, 0) + 1
+
+
+def profiled(fn):
+    """
+    Decorador que mide las llamadas a fn cuando hay un perfil activo
+    """
+    name = fn.__qualname__
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        profile = getattr(_local, "profile", None)
+        if profile is None:
+            return fn(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profile.record(name, time.perf_counter() - start)
+
+    return wrapper
@@ -0,0 +1,186 @@
+# Informes semanales y mensuales de todos los usuarios, sin Streamlit
+#
+# Reutiliza los mismos cálculos del tablero (totales, días sobre el límite,
+# costo según water_rates y consejos de utils) para generar un informe JSON
+# por usuario y un resumen global. Los usuarios se reparten en lotes entre
+# los procesos de un ProcessPoolExecutor; cada proceso abre su propio
+# almacenamiento (H2OMIGA_STORAGE / H2OMIGA_DATA_PATH) y escribe sus informes.
+# Los procesos se inician con "spawn" y no con fork: así no heredan el
+# almacenamiento del proceso principal ni su conexión SQLite abierta, que
+# no puede usarse a través de un fork().
+#
+# Uso: python reports.py [--out informes/] [--workers 4] [--date AAAA-MM-DD]
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from consumption import usage_summary, activity_shares
+from storage import get_storage
+from tip_engine import get_tip_engine
+from utils import calculate_savings, calculate_cost_savings
+
+REPORT_PERIODS = {"weekly": 7, "monthly": 30}
+SHARDS_PER_WORKER = 4
+
+
+def report_filename(username):
+    """
+    Devuelve un nombre de archivo seguro y único para el informe de un usuario
+    """
+    slug = re.sub(r"[^A-Za-z0-9_-]+", "_", username.strip()).strip("_") or "usuario"
+    digest = hashlib.sha1(username.encode("utf-8")).hexdigest()[:8]
+    return f"{slug}-{digest}.json"
+
+
+def build_report(username, record, today):
+    """
+    Calcula el informe de un usuario
+
+    Args:
+        username: Nombre del usuario
+        record: Registro del usuario
+        today: Fecha final de los periodos
+
+    Returns:
+        Dict con el resumen semanal, el mensual y los consejos de ahorro
+    """
+    city = record.get("city", "Lima")
+    report = {
+        "username": username,
+        "city": city,
+        "date": today.strftime("%Y-%m-%d"),
+    }
+    for name, days in REPORT_PERIODS.items():
+        report[name] = usage_summary(record, days, today)
+
+    # Consejos según el promedio diario y el peso de cada actividad en la última semana
+    daily_average = report["weekly"]["daily_average"]
+    shares = activity_shares(record, REPORT_PERIODS["weekly"], today)
+    tips = []
+    for tip in get_tip_engine().recommend(daily_average, shares):
+        savings = calculate_savings(tip, daily_average, shares)
+        _, monthly_savings = calculate_cost_savings(savings, city)
+        tips.append({
+            "id": tip["id"],
+            "description": tip["description"],
+            "daily_savings_liters": savings,
+            "monthly_savings_soles": monthly_savings,
+        })
+    report["tips"] = tips
+    return report
+
+
+def _report_shard(usernames, out_dir, date):
+    """
+    Genera y escribe los informes de un lote de usuarios (se ejecuta en un proceso)
+
+    Returns:
+        Lista de resúmenes breves, uno por usuario
+    """
+    storage = get_storage()
+    today = datetime.strptime(date, "%Y-%m-%d").date()
+    rows = []
+
+    for username in usernames:
+        record = storage.get_user(username)
+        if record is None:  # Eliminado mientras se generaban los informes
+            continue
+        report = build_report(username, record, today)
+        filename = report_filename(username)
+        with open(os.path.join(out_dir, filename), 'w', encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+        rows.append({
+            "username": username,
+            "city": report["city"],
+            "file": filename,
+            "weekly_liters": report["weekly"]["total_liters"],
+            "monthly_liters": report["monthly"]["total_liters"],
+            "monthly_cost": report["monthly"]["cost"],
+            "weekly_days_over_limit": report["weekly"]["days_over_limit"],
+        })
+    return rows
+
+
+def _shards(usernames, count):
+    size = max(1, -(-len(usernames) // count))
+    return [usernames[i:i + size] for i in range(0, len(usernames), size)]
+
+
+def summarize(rows, date):
+    """
+    Combina los resúmenes de todos los usuarios en el resumen global
+    """
+    by_city = {}
+    for row in rows:
+        city = by_city.setdefault(row["city"], {"users": 0, "monthly_liters": 0, "monthly_cost": 0})
+        city["users"] += 1
+        city["monthly_liters"] += row["monthly_liters"]
+        city["monthly_cost"] += row["monthly_cost"]
+
+    return {
+        "date": date,
+        "users": len(rows),
+        "weekly_liters": sum(row["weekly_liters"] for row in rows),
+        "monthly_liters": sum(row["monthly_liters"] for row in rows),
+        "monthly_cost": sum(row["monthly_cost"] for row in rows),
+        "users_over_limit": sum(1 for row in rows if row["weekly_days_over_limit"]),
+        "by_city": by_city,
+        "reports": sorted(rows, key=lambda row: row["username"]),
+    }
+
+
+def generate_reports(out_dir, workers=None, date=None):
+    """
+    Genera los informes de todos los usuarios del almacenamiento
+
+    Args:
+        out_dir: Directorio de salida (se crea si no existe)
+        workers: Número de procesos (por defecto, uno por núcleo)
+        date: Fecha final de los periodos (AAAA-MM-DD, por defecto hoy)
+
+    Returns:
+        Resumen global (también se escribe en summary.json)
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    date = date or datetime.now().strftime("%Y-%m-%d")
+    workers = workers or os.cpu_count() or 1
+    usernames = get_storage().list_users()
+
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context("spawn")) as executor:
+        futures = [executor.submit(_report_shard, shard, out_dir, date)
+                   for shard in _shards(usernames, workers * SHARDS_PER_WORKER)]
+        for future in as_completed(futures):
+            rows.extend(future.result())
+
+    summary = summarize(rows, date)
+    with open(os.path.join(out_dir, "summary.json"), 'w', encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera los informes semanales y mensuales de todos los usuarios")
+    parser.add_argument("--out", default="informes", help="Directorio de salida")
+    parser.add_argument("--workers", type=int, help="Número de procesos (por defecto, uno por núcleo)")
+    parser.add_argument("--date", help="Fecha final de los informes (AAAA-MM-DD, por defecto hoy)")
+    args = parser.parse_args()
+
+    if args.date:
+        try:
+            datetime.strptime(args.date, "%Y-%m-%d")
+        except ValueError:
+            print(f"Fecha inválida '{args.date}' (se espera AAAA-MM-DD)")
+            raise SystemExit(1)
+
+    summary = generate_reports(args.out, args.workers, args.date)
+    print(f"{summary['users']} informes escritos en {args.out} "
+          f"({summary['users_over_limit']} usuarios sobre el límite esta semana)")
@@ -0,0 +1,170 @@
+# Simulador de ahorro sobre el historial completo de un usuario
+#
+# Aplica cada consejo de water_saving_tips, y las combinaciones de hasta
+# MAX_COMBINATION consejos, a todos los días registrados a la vez: el
+# historial es una matriz días x actividades en litros (ConsumptionMatrix) y
+# los escenarios se evalúan juntos como un arreglo escenarios x días x
+# actividades.
+#
+# Modelo de cada consejo, día a día:
+#   - factor de reducción f sobre una actividad: quita f de sus litros
+#   - ahorro absoluto p sobre una actividad: quita hasta p litros los días
+#     en que se practica
+#   - consejos generales (sin actividad): igual, sobre el total del día,
+#     después de los consejos por actividad
+# Los litros negativos (p. ej. reparar una fuga) no se modifican.
+# Varios factores sobre la misma actividad se encadenan (1 - f1) * (1 - f2).
+#
+# Uso: python savings_simulator.py <usuario> [--combinations 2] [--top 10]
+
+import argparse
+from itertools import combinations
+
+import numpy as np
+
+from consumption_matrix import ACTIVITY_INDEX, ACTIVITY_KEYS, ConsumptionMatrix
+from data import water_rates, DEFAULT_WATER_RATE
+from utils import water_saving_tips
+
+# Tamaño máximo de las combinaciones de consejos (además de todos juntos)
+MAX_COMBINATION = 2
+DAYS_PER_MONTH = 30
+
+
+def _tip_arrays(tips):
+    """
+    Separa los consejos en arreglos de factores y ahorros absolutos
+
+    Returns:
+        Tupla (factores por actividad, absolutos por actividad, factores
+        generales, absolutos generales), con una fila o posición por consejo
+    """
+    activity_factors = np.zeros((len(tips), len(ACTIVITY_KEYS)))
+    activity_absolutes = np.zeros((len(tips), len(ACTIVITY_KEYS)))
+    general_factors = np.zeros(len(tips))
+    general_absolutes = np.zeros(len(tips))
+
+    for i, tip in enumerate(tips):
+        savings = tip["potential_savings"]
+        is_factor = savings <= 1
+        if tip["activity"] is None:
+            (general_factors if is_factor else general_absolutes)[i] = savings
+            continue
+        if tip["activity"] not in ACTIVITY_INDEX:
+            raise ValueError(f"Actividad desconocida en el consejo {tip['id']}: {tip['activity']}")
+        column = ACTIVITY_INDEX[tip["activity"]]
+        (activity_factors if is_factor else activity_absolutes)[i, column] = savings
+
+    return activity_factors, activity_absolutes, general_factors, general_absolutes
+
+
+def build_scenarios(tip_count, max_combination=MAX_COMBINATION):
+    """
+    Devuelve la matriz de escenarios x consejos (True si el consejo se aplica)
+
+    Incluye cada consejo solo, las combinaciones de hasta max_combination
+    consejos y todos los consejos juntos.
+    """
+    scenarios = [combo for size in range(1, min(max_combination, tip_count) + 1)
+                 for combo in combinations(range(tip_count), size)]
+    if tip_count > max_combination:
+        scenarios.append(tuple(range(tip_count)))
+
+    membership = np.zeros((len(scenarios), tip_count), dtype=bool)
+    for row, combo in enumerate(scenarios):
+        membership[row, list(combo)] = True
+    return membership
+
+
+def simulate_liters(liters, tips, membership):
+    """
+    Calcula los litros ahorrados por cada escenario en todo el historial
+
+    Args:
+        liters: Litros por día y actividad (días x actividades)
+        tips: Lista de consejos
+        membership: Matriz escenarios x consejos de build_scenarios
+
+    Returns:
+        Vector con los litros ahorrados por escenario
+    """
+    activity_factors, activity_absolutes, general_factors, general_absolutes = _tip_arrays(tips)
+
+    # Fracción que queda de cada actividad y litros fijos que se quitan (escenarios x actividades)
+    remaining_fraction = np.prod(np.where(membership[:, :, None], 1 - activity_factors[None], 1), axis=1)
+    removed = membership @ activity_absolutes
+    general_fraction = np.prod(np.where(membership, 1 - general_factors, 1), axis=1)
+    general_removed = membership @ general_absolutes
+
+    # Los consejos sólo reducen consumos; las actividades con litros negativos
+    # (p. ej. reparar una fuga) no cambian
+    consumed = np.maximum(liters, 0)
+
+    # Escenarios x días x actividades
+    remaining = np.maximum(consumed[None] * remaining_fraction[:, None, :] - removed[:, None, :], 0)
+    day_remaining = np.maximum(remaining.sum(axis=2) * general_fraction[:, None]
+                               - general_removed[:, None], 0)
+
+    return consumed.sum() - day_remaining.sum(axis=1)
+
+
+def simulate(record, tips=None, max_combination=MAX_COMBINATION):
+    """
+    Proyecta el ahorro mensual de cada consejo y combinación sobre el historial de un usuario
+
+    Args:
+        record: Registro del usuario
+        tips: Consejos a simular (por defecto todo water_saving_tips)
+        max_combination: Tamaño máximo de las combinaciones
+
+    Returns:
+        Lista de escenarios de mayor a menor ahorro, cada uno con los ids y
+        descripciones de sus consejos, litros y soles ahorrados al mes y
+        porcentaje del consumo
+    """
+    tips = water_saving_tips if tips is None else tips
+    matrix = ConsumptionMatrix.from_record(record)
+    if len(matrix) == 0 or not tips:
+        return []
+
+    liters = matrix.activity_liters().astype(float)
+    membership = build_scenarios(len(tips), max_combination)
+    saved = simulate_liters(liters, tips, membership)
+
+    # Promedio sobre todo el periodo del historial, incluidos los días sin registros
+    history_days = int((matrix.dates[-1] - matrix.dates[0]).astype(int)) + 1
+    monthly_liters = saved / history_days * DAYS_PER_MONTH
+    total = np.maximum(liters, 0).sum()
+    rate = water_rates.get(record.get("city", "Lima"), DEFAULT_WATER_RATE)
+
+    results = []
+    for row in np.argsort(-saved, kind="stable"):
+        chosen = [tips[i] for i in np.flatnonzero(membership[row])]
+        results.append({
+            "tips": [tip["id"] for tip in chosen],
+            "descriptions": [tip["description"] for tip in chosen],
+            "monthly_liters": float(monthly_liters[row]),
+            "monthly_soles": float(monthly_liters[row]) / 1000 * rate,
+            "percent": float(saved[row] / total * 100) if total else 0.0,
+        })
+    return results
+
+
+if __name__ == "__main__":
+    from users import load_user
+
+    parser = argparse.ArgumentParser(description="Simula el ahorro de los consejos sobre el historial de un usuario")
+    parser.add_argument("username")
+    parser.add_argument("--combinations", type=int, default=MAX_COMBINATION,
+                        help="Tamaño máximo de las combinaciones de consejos")
+    parser.add_argument("--top", type=int, default=10, help="Escenarios a mostrar")
+    args = parser.parse_args()
+
+    record = load_user(args.username)
+    if record is None:
+        parser.error(f"Usuario desconocido: {args.username}")
+
+    print(f"{'consejos':<24}{'L/mes':>10}{'S/ mes':>10}{'%':>7}")
+    for scenario in simulate(record, max_combination=args.combinations)[:args.top]:
+        tips = "+".join(map(str, scenario["tips"]))
+        print(f"{tips:<24}{scenario['monthly_liters']:10.1f}{scenario['monthly_soles']:10.2f}{scenario['percent']:7.1f}")
@@ -0,0 +1,833 @@
+# Capa de almacenamiento de los datos de usuario
+#
+# Define dos motores intercambiables con la misma interfaz:
+#   - JSONStorage: un único archivo JSON, pensado para instalaciones pequeñas.
+#   - SQLiteStorage: base de datos SQLite en modo WAL, con tablas para
+#     usuarios, conteos diarios de actividades y consejos mostrados.
+#
+# El motor se elige con la variable de entorno H2OMIGA_STORAGE ("json" o
+# "sqlite") y la ruta del archivo con H2OMIGA_DATA_PATH.
+#
+# Las modificaciones se hacen con update_user(username, update), donde
+# update recibe el registro actual (o None si el usuario no existe) y
+# devuelve el registro nuevo. Así la lectura y la escritura ocurren dentro
+# del mismo bloqueo y dos sesiones simultáneas no pierden sus cambios.
+# update_many aplica varias de estas funciones en una sola escritura.
+# get_user_since(username, start) lee sólo los días desde una fecha, para
+# las consultas de los últimos días sin cargar todo el historial.
+#
+# Los hogares (ver households.py) se leen y modifican igual, con
+# get_household(name) y update_household(name, update). El hogar de cada
+# usuario se guarda en el campo "household" de su registro, que es lo que
+# define a los miembros (household_member_totals).
+
+import copy
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+
+from consumption import daily_totals, total_liters
+from metrics import STORAGE_FILE_BYTES, STORAGE_LATENCY
+from profiling import add_bytes, add_event
+
+try:
+    import fcntl
+except ImportError:  # Windows: sólo se protege entre hilos del mismo proceso
+    fcntl = None
+
+DEFAULT_JSON_PATH = "user_data.json"
+DEFAULT_SQLITE_PATH = "h2omiga.db"
+
+# Caché de documentos JSON compartida por todas las sesiones del proceso:
+# ruta absoluta -> (firma del archivo, documento). La firma cambia con cada
+# reemplazo del archivo, así que una lectura repetida sólo cuesta un stat().
+_document_cache = {}
+_document_cache_lock = threading.Lock()
+
+# Máscara de permisos del proceso, leída una vez al importar el módulo
+# (os.umask sólo permite consultarla cambiándola)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _file_signature(stat_result):
+    return (stat_result.st_ino, stat_result.st_mtime_ns,
+            stat_result.st_ctime_ns, stat_result.st_size)
+
+
+def _file_mode(path):
+    """
+    Devuelve los permisos de un archivo, o los de un archivo nuevo según la
+    máscara del proceso si aún no existe
+    """
+    try:
+        return os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def households_path(path):
+    """
+    Devuelve la ruta del documento de hogares que acompaña a un archivo JSON de usuarios
+    """
+    return os.path.splitext(path)[0] + ".households.json"
+
+
+def new_user_record(city):
+    """
+    Devuelve el registro vacío de un usuario nuevo
+    """
+    return {
+        "city": city,
+        "consumption": {},
+        "daily_totals": {},
+        "total_liters": 0,
+        "tips_shown": []
+    }
+
+
+def _copy_user(record):
+    """
+    Copia los campos de un registro que update_user puede modificar en el
+    lugar, para comparar después sólo lo que cambió
+    """
+    return {
+        "city": record.get("city", "Lima"),
+        "consumption": {date: dict(activities) for date, activities in record["consumption"].items()},
+        "daily_totals": dict(record["daily_totals"]),
+        "total_liters": record["total_liters"],
+        "tips_shown": list(record["tips_shown"]),
+        "household": record.get("household"),
+    }
+
+
+class PartialUpdateError(Exception):
+    """
+    Algunas modificaciones de update_many fallaron y las demás sí se guardaron
+
+    Attributes:
+        errors: Dict {usuario: excepción} de las modificaciones que fallaron
+        results: Dict {usuario: registro guardado} de las que se aplicaron
+    """
+
+    def __init__(self, errors, results):
+        super().__init__(f"Fallaron las modificaciones de {len(errors)} usuarios: {', '.join(errors)}")
+        self.errors = errors
+        self.results = results
+
+
+def _raise_errors(errors, results):
+    """
+    Propaga los errores de update_many: el error original si falló todo, o
+    PartialUpdateError si una parte sí se guardó
+    """
+    if not errors:
+        return
+    if not results:
+        raise next(iter(errors.values()))
+    raise PartialUpdateError(errors, results)
+
+
+class _PendingUpdate:
+    """
+    Modificación de un usuario a la espera de ser escrita en disco
+    """
+
+    def __init__(self, username, update):
+        self.username = username
+        self.update = update
+        self.result = None
+        self.error = None
+        self.done = False
+
+
+class JSONStorage:
+    """
+    Motor de almacenamiento basado en un único archivo JSON.
+
+    Cada escritura reescribe el archivo completo en un archivo temporal que
+    luego reemplaza al original (os.replace es atómico), bajo un bloqueo
+    consultivo sobre "<ruta>.lock". Las modificaciones que llegan mientras
+    otra escritura está en curso se agrupan y se aplican en una sola
+    reescritura del archivo.
+    """
+
+    def __init__(self, path=DEFAULT_JSON_PATH, metrics_label="json"):
+        self.path = path
+        # Etiqueta "backend" de las métricas y nombre del archivo en el perfil
+        self.metrics_label = metrics_label
+        self.file_name = os.path.basename(path)
+        self.cache_key = os.path.abspath(path)
+        self.lock_path = path + ".lock"
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._household_store = None
+
+    @contextmanager
+    def _file_lock(self):
+        """
+        Bloqueo exclusivo entre procesos sobre el archivo de datos
+        """
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self):
+        """
+        Lee el documento, reutilizando la caché si el archivo no ha cambiado
+        """
+        try:
+            signature = _file_signature(os.stat(self.path))
+        except FileNotFoundError:
+            return {}
+        cached = _document_cache.get(self.cache_key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        with STORAGE_LATENCY.time(backend=self.metrics_label, operation="read"), open(self.path, 'r') as f:
+            # La firma se toma del descriptor abierto para que corresponda al contenido leído
+            stat = os.fstat(f.fileno())
+            signature = _file_signature(stat)
+            data = json.load(f)
+        STORAGE_FILE_BYTES.set(stat.st_size, backend=self.metrics_label)
+        add_bytes("read", stat.st_size)
+        add_event(f"Lecturas de {self.file_name}")
+        self._cache(signature, data)
+        return data
+
+    def _cache(self, signature, data):
+        with _document_cache_lock:
+            _document_cache[self.cache_key] = (signature, data)
+
+    def invalidate_cache(self):
+        """
+        Descarta el documento en caché para forzar una nueva lectura
+        """
+        with _document_cache_lock:
+            _document_cache.pop(self.cache_key, None)
+
+    def _write(self, data):
+        # Escribir en un temporal del mismo directorio y reemplazar de forma atómica
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".user_data.", suffix=".tmp", dir=directory)
+        try:
+            with STORAGE_LATENCY.time(backend=self.metrics_label, operation="write"), os.fdopen(fd, 'w') as f:
+                json.dump(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            # mkstemp crea el temporal con permisos 0600: conservar los del
+            # archivo actual para no cambiarlos en cada escritura
+            os.chmod(tmp_path, _file_mode(self.path))
+            os.replace(tmp_path, self.path)
+            # Las escrituras se hacen bajo el bloqueo: nadie más pudo reemplazar el archivo
+            stat = os.stat(self.path)
+            signature = _file_signature(stat)
+        except BaseException:
+            self.invalidate_cache()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        STORAGE_FILE_BYTES.set(stat.st_size, backend=self.metrics_label)
+        add_bytes("written", stat.st_size)
+        add_event(f"Escrituras de {self.file_name}")
+        self._cache(signature, data)
+
+    def _flush(self, batch):
+        """
+        Aplica un lote de modificaciones con una única reescritura del archivo
+        """
+        try:
+            with self._file_lock():
+                # Copia superficial: el documento en caché lo pueden estar leyendo otras sesiones
+                data = dict(self._read())
+                changed = False
+                for pending in batch:
+                    current = data.get(pending.username)
+                    try:
+                        record = pending.update(copy.deepcopy(current))
+                    except Exception as e:
+                        pending.error = e
+                        continue
+                    if record is not None and record != current:
+                        data[pending.username] = record
+                        changed = True
+                    pending.result = record
+                # Sin cambios no se reescribe el archivo
+                if changed:
+                    self._write(data)
+        except Exception as e:
+            for pending in batch:
+                if pending.error is None:
+                    pending.error = e
+        finally:
+            for pending in batch:
+                pending.done = True
+
+    def load_all(self):
+        """
+        Devuelve el documento completo {usuario: registro}
+
+        El documento se comparte entre sesiones a través de la caché y no
+        debe modificarse; los cambios se hacen con update_user o save_all.
+        """
+        return self._read()
+
+    def save_all(self, data):
+        """
+        Reemplaza el documento completo
+        """
+        with self._flush_lock, self._file_lock():
+            self._write(dict(data))
+
+    def get_user(self, username):
+        """
+        Devuelve el registro de un usuario o None si no existe (sólo lectura)
+        """
+        return self.load_all().get(username)
+
+    def get_user_since(self, username, start):
+        """
+        Devuelve el registro de un usuario sólo con los días desde start
+        (YYYY-MM-DD, incluido), o None si no existe (sólo lectura)
+        """
+        record = self.get_user(username)
+        if record is None:
+            return None
+        return dict(
+            record,
+            consumption={date: activities for date, activities in record.get("consumption", {}).items()
+                         if date >= start},
+            daily_totals={date: liters for date, liters in daily_totals(record).items() if date >= start},
+            total_liters=total_liters(record),
+        )
+
+    def update_user(self, username, update):
+        """
+        Modifica un usuario leyendo y escribiendo bajo el mismo bloqueo
+
+        Args:
+            username: Nombre del usuario
+            update: Función que recibe el registro actual (None si no existe)
+                y devuelve el registro nuevo
+
+        Returns:
+            El registro guardado
+        """
+        return self.update_many({username: update})[username]
+
+    def update_many(self, updates):
+        """
+        Modifica varios usuarios con una sola reescritura del archivo
+
+        Args:
+            updates: Dict {usuario: función de modificación}; si la función
+                devuelve None el usuario no se modifica
+
+        Returns:
+            Dict {usuario: registro guardado}
+
+        Raises:
+            PartialUpdateError: Si algunas modificaciones fallaron y las demás
+                se guardaron (si fallan todas se propaga el error original)
+        """
+        pendings = [_PendingUpdate(username, update) for username, update in updates.items()]
+        with self._pending_lock:
+            self._pending.extend(pendings)
+        with self._flush_lock:
+            # Si otro hilo ya incluyó estas modificaciones en su lote no hay nada que hacer
+            if not all(pending.done for pending in pendings):
+                with self._pending_lock:
+                    batch, self._pending = self._pending, []
+                self._flush(batch)
+        errors = {pending.username: pending.error for pending in pendings if pending.error is not None}
+        results = {pending.username: pending.result for pending in pendings if pending.error is None}
+        _raise_errors(errors, results)
+        return results
+
+    def upsert_user(self, username, record):
+        """
+        Crea o reemplaza el registro de un usuario
+        """
+        self.update_user(username, lambda current: record)
+
+    def list_users(self):
+        """
+        Devuelve los nombres de todos los usuarios registrados
+        """
+        return list(self.load_all().keys())
+
+    def window_totals(self, start, end):
+        """
+        Recorre los usuarios con registros entre start y end (incluidos) como
+        (nombre, ciudad, litros del periodo, días registrados del periodo)
+        """
+        for username, record in self.load_all().items():
+            liters = [value for date, value in daily_totals(record).items() if start <= date <= end]
+            if liters:
+                yield username, record.get("city", "Lima"), sum(liters), len(liters)
+
+    def _households(self):
+        # Los hogares van en su propio documento, junto al de usuarios
+        if self._household_store is None:
+            self._household_store = JSONStorage(households_path(self.path), "json_households")
+        return self._household_store
+
+    def get_household(self, name):
+        """
+        Devuelve el registro de un hogar o None si no existe (sólo lectura)
+        """
+        return self._households().get_user(name)
+
+    def update_household(self, name, update):
+        """
+        Modifica un hogar leyendo y escribiendo bajo el mismo bloqueo
+        """
+        return self._households().update_user(name, update)
+
+    def list_households(self):
+        return self._households().list_users()
+
+    def household_member_totals(self, name):
+        """
+        Devuelve los litros acumulados de cada usuario del hogar {usuario: litros}
+        """
+        return {username: total_liters(record) for username, record in self.load_all().items()
+                if record.get("household") == name}
+
+
+class SQLiteStorage:
+    """
+    Motor de almacenamiento basado en SQLite (modo WAL).
+
+    Las lecturas y escrituras de un usuario sólo tocan sus propias filas,
+    de modo que su costo no depende del número total de usuarios.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS users (
+            name TEXT PRIMARY KEY,
+            city TEXT NOT NULL,
+            total_liters REAL NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS consumption (
+            username TEXT NOT NULL REFERENCES users(name) ON DELETE CASCADE,
+            date TEXT NOT NULL,
+            activity TEXT NOT NULL,
+            quantity INTEGER NOT NULL,
+            PRIMARY KEY (username, date, activity)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS daily_totals (
+            username TEXT NOT NULL REFERENCES users(name) ON DELETE CASCADE,
+            date TEXT NOT NULL,
+            liters REAL NOT NULL,
+            PRIMARY KEY (username, date)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS tips_shown (
+            username TEXT NOT NULL REFERENCES users(name) ON DELETE CASCADE,
+            position INTEGER NOT NULL,
+            tip_id INTEGER NOT NULL,
+            PRIMARY KEY (username, position)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS households (
+            name TEXT PRIMARY KEY,
+            city TEXT NOT NULL,
+            total_liters REAL NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS household_members (
+            username TEXT PRIMARY KEY REFERENCES users(name) ON DELETE CASCADE,
+            household TEXT NOT NULL REFERENCES households(name) ON DELETE CASCADE
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS household_members_by_household
+            ON household_members (household);
+        CREATE TABLE IF NOT EXISTS household_daily (
+            household TEXT NOT NULL REFERENCES households(name) ON DELETE CASCADE,
+            date TEXT NOT NULL,
+            liters REAL NOT NULL,
+            PRIMARY KEY (household, date)
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path=DEFAULT_SQLITE_PATH):
+        self.path = path
+        # Streamlit ejecuta cada sesión en su propio hilo: una conexión por hilo
+        self._local = threading.local()
+        conn = self._connect()
+        conn.executescript(self.SCHEMA)
+        self._migrate_schema(conn)
+
+    def _migrate_schema(self, conn):
+        """
+        Añade los totales precalculados a bases creadas antes de que existieran
+        """
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(users)")]
+        if "total_liters" in columns:
+            return
+        with self._transaction() as conn:
+            conn.execute("ALTER TABLE users ADD COLUMN total_liters REAL NOT NULL DEFAULT 0")
+            for (username,) in conn.execute("SELECT name FROM users").fetchall():
+                record = self._read_user(conn, username, None, 0)
+                # Sin totales guardados: daily_totals() los calcula a partir del detalle
+                del record["daily_totals"], record["total_liters"]
+                self._write_totals(conn, username, record)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Sin transacciones implícitas: se abren explícitamente en _transaction
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """
+        Transacción de escritura (BEGIN IMMEDIATE toma el bloqueo al inicio)
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        STORAGE_FILE_BYTES.set(os.path.getsize(self.path), backend="sqlite")
+
+    def _read_user(self, conn, username, city, user_total_liters, start=""):
+        # Las fechas son texto YYYY-MM-DD: "" incluye todo el historial y
+        # date >= ? usa la clave primaria (username, date)
+        record = new_user_record(city)
+        rows = conn.execute(
+            "SELECT date, activity, quantity FROM consumption "
+            "WHERE username = ? AND date >= ? ORDER BY date",
+            (username, start)
+        )
+        for date, activity, quantity in rows:
+            record["consumption"].setdefault(date, {})[activity] = quantity
+        record["daily_totals"] = dict(conn.execute(
+            "SELECT date, liters FROM daily_totals WHERE username = ? AND date >= ? ORDER BY date",
+            (username, start)
+        ))
+        record["total_liters"] = user_total_liters
+        record["tips_shown"] = [
+            tip_id for (tip_id,) in conn.execute(
+                "SELECT tip_id FROM tips_shown WHERE username = ? ORDER BY position",
+                (username,)
+            )
+        ]
+        household = conn.execute(
+            "SELECT household FROM household_members WHERE username = ?", (username,)
+        ).fetchone()
+        if household is not None:
+            record["household"] = household[0]
+        return record
+
+    def _write_totals(self, conn, username, record):
+        conn.execute("UPDATE users SET total_liters = ? WHERE name = ?",
+                     (total_liters(record), username))
+        conn.execute("DELETE FROM daily_totals WHERE username = ?", (username,))
+        conn.executemany(
+            "INSERT INTO daily_totals (username, date, liters) VALUES (?, ?, ?)",
+            [(username, date, liters) for date, liters in daily_totals(record).items()]
+        )
+
+    def _write_user(self, conn, username, record, before=None):
+        """
+        Guarda un usuario; con before (el registro leído antes de modificarlo)
+        sólo se reescriben los días y campos que cambian
+        """
+        if before is None:
+            self._write_new_user(conn, username, record)
+            return
+
+        if record.get("city", "Lima") != before.get("city", "Lima") or \
+                total_liters(record) != before["total_liters"]:
+            conn.execute("UPDATE users SET city = ?, total_liters = ? WHERE name = ?",
+                         (record.get("city", "Lima"), total_liters(record), username))
+
+        consumption = record.get("consumption", {})
+        old_consumption = before["consumption"]
+        changed = [date for date in consumption.keys() | old_consumption.keys()
+                   if consumption.get(date) != old_consumption.get(date)]
+        conn.executemany("DELETE FROM consumption WHERE username = ? AND date = ?",
+                         [(username, date) for date in changed])
+        conn.executemany(
+            "INSERT INTO consumption (username, date, activity, quantity) VALUES (?, ?, ?, ?)",
+            [
+                (username, date, activity, quantity)
+                for date in changed
+                for activity, quantity in consumption.get(date, {}).items()
+            ]
+        )
+
+        totals = daily_totals(record)
+        old_totals = before["daily_totals"]
+        conn.executemany(
+            "DELETE FROM daily_totals WHERE username = ? AND date = ?",
+            [(username, date) for date in old_totals.keys() - totals.keys()]
+        )
+        conn.executemany(
+            "INSERT INTO daily_totals (username, date, liters) VALUES (?, ?, ?) "
+            "ON CONFLICT(username, date) DO UPDATE SET liters = excluded.liters",
+            [(username, date, liters) for date, liters in totals.items() if old_totals.get(date) != liters]
+        )
+
+        if record.get("tips_shown", []) != before["tips_shown"]:
+            self._write_tips_shown(conn, username, record)
+        if record.get("household") != before.get("household"):
+            self._write_household_member(conn, username, record)
+
+    def _write_new_user(self, conn, username, record):
+        conn.execute(
+            "INSERT INTO users (name, city) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET city = excluded.city",
+            (username, record.get("city", "Lima"))
+        )
+        self._write_totals(conn, username, record)
+        conn.execute("DELETE FROM consumption WHERE username = ?", (username,))
+        conn.executemany(
+            "INSERT INTO consumption (username, date, activity, quantity) VALUES (?, ?, ?, ?)",
+            [
+                (username, date, activity, quantity)
+                for date, activities in record.get("consumption", {}).items()
+                for activity, quantity in activities.items()
+            ]
+        )
+        self._write_tips_shown(conn, username, record)
+        self._write_household_member(conn, username, record)
+
+    def _write_tips_shown(self, conn, username, record):
+        conn.execute("DELETE FROM tips_shown WHERE username = ?", (username,))
+        conn.executemany(
+            "INSERT INTO tips_shown (username, position, tip_id) VALUES (?, ?, ?)",
+            [
+                (username, position, tip_id)
+                for position, tip_id in enumerate(record.get("tips_shown", []))
+            ]
+        )
+
+    def _write_household_member(self, conn, username, record):
+        conn.execute("DELETE FROM household_members WHERE username = ?", (username,))
+        if record.get("household"):
+            conn.execute("INSERT INTO household_members (username, household) VALUES (?, ?)",
+                         (username, record["household"]))
+
+    def load_all(self):
+        conn = self._connect()
+        return {
+            name: self._read_user(conn, name, city, user_total)
+            for name, city, user_total in conn.execute(
+                "SELECT name, city, total_liters FROM users ORDER BY rowid"
+            ).fetchall()
+        }
+
+    def save_all(self, data):
+        with STORAGE_LATENCY.time(backend="sqlite", operation="write"), self._transaction() as conn:
+            existing = {name for (name,) in conn.execute("SELECT name FROM users")}
+            for username in existing - set(data):
+                conn.execute("DELETE FROM users WHERE name = ?", (username,))
+            for username, record in data.items():
+                self._write_user(conn, username, record)
+
+    def _get_user(self, conn, username, start=""):
+        row = conn.execute(
+            "SELECT city, total_liters FROM users WHERE name = ?", (username,)
+        ).fetchone()
+        if row is None:
+            return None
+        return self._read_user(conn, username, *row, start=start)
+
+    def get_user(self, username):
+        with STORAGE_LATENCY.time(backend="sqlite", operation="read"):
+            return self._get_user(self._connect(), username)
+
+    def get_user_since(self, username, start):
+        with STORAGE_LATENCY.time(backend="sqlite", operation="read"):
+            return self._get_user(self._connect(), username, start)
+
+    def update_user(self, username, update):
+        return self.update_many({username: update})[username]
+
+    def update_many(self, updates):
+        results = {}
+        errors = {}
+        with STORAGE_LATENCY.time(backend="sqlite", operation="write"), self._transaction() as conn:
+            for username, update in updates.items():
+                # Un punto de guardado por usuario: si su modificación falla,
+                # se deshace sólo la suya y las demás se guardan
+                conn.execute("SAVEPOINT update_user")
+                try:
+                    current = self._get_user(conn, username)
+                    before = _copy_user(current) if current is not None else None
+                    record = update(current)
+                    if record is not None:
+                        self._write_user(conn, username, record, before)
+                except Exception as e:
+                    conn.execute("ROLLBACK TO update_user")
+                    errors[username] = e
+                else:
+                    results[username] = record
+                conn.execute("RELEASE update_user")
+        _raise_errors(errors, results)
+        return results
+
+    def upsert_user(self, username, record):
+        with STORAGE_LATENCY.time(backend="sqlite", operation="write"), self._transaction() as conn:
+            self._write_user(conn, username, record)
+
+    def list_users(self):
+        conn = self._connect()
+        return [name for (name,) in conn.execute("SELECT name FROM users ORDER BY rowid")]
+
+    def window_totals(self, start, end):
+        conn = self._connect()
+        return conn.execute("""
+            SELECT u.name, u.city, SUM(d.liters), COUNT(d.date)
+            FROM users u JOIN daily_totals d
+                ON d.username = u.name AND d.date BETWEEN ? AND ?
+            GROUP BY u.name ORDER BY u.rowid
+        """, (start, end)).fetchall()
+
+    def _get_household(self, conn, name):
+        row = conn.execute(
+            "SELECT city, total_liters FROM households WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "city": row[0],
+            "members": [username for (username,) in conn.execute(
+                "SELECT username FROM household_members WHERE household = ? ORDER BY username",
+                (name,)
+            )],
+            "daily_totals": dict(conn.execute(
+                "SELECT date, liters FROM household_daily WHERE household = ? ORDER BY date",
+                (name,)
+            )),
+            "monthly_totals": dict(conn.execute(
+                "SELECT substr(date, 1, 7), SUM(liters) FROM household_daily "
+                "WHERE household = ? GROUP BY 1 ORDER BY 1",
+                (name,)
+            )),
+            "total_liters": row[1],
+        }
+
+    def get_household(self, name):
+        return self._get_household(self._connect(), name)
+
+    def update_household(self, name, update):
+        """
+        Modifica un hogar; sólo se reescriben los días que cambian (si update
+        devuelve None el hogar no se modifica)
+
+        Los miembros salen del campo "household" de cada usuario, así que
+        aquí se ignora la lista "members" del registro.
+        """
+        with STORAGE_LATENCY.time(backend="sqlite", operation="write"), self._transaction() as conn:
+            current = self._get_household(conn, name)
+            before = current["daily_totals"] if current is not None else {}
+            record = update(copy.deepcopy(current))
+            if record is None:
+                return None
+            conn.execute(
+                "INSERT INTO households (name, city, total_liters) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET city = excluded.city, total_liters = excluded.total_liters",
+                (name, record.get("city", "Lima"), record.get("total_liters", 0))
+            )
+            after = record.get("daily_totals", {})
+            conn.executemany(
+                "DELETE FROM household_daily WHERE household = ? AND date = ?",
+                [(name, date) for date in before.keys() - after.keys()]
+            )
+            conn.executemany(
+                "INSERT INTO household_daily (household, date, liters) VALUES (?, ?, ?) "
+                "ON CONFLICT(household, date) DO UPDATE SET liters = excluded.liters",
+                [(name, date, liters) for date, liters in after.items() if before.get(date) != liters]
+            )
+        return record
+
+    def list_households(self):
+        conn = self._connect()
+        return [name for (name,) in conn.execute("SELECT name FROM households ORDER BY rowid")]
+
+    def household_member_totals(self, name):
+        conn = self._connect()
+        return dict(conn.execute(
+            "SELECT m.username, u.total_liters FROM household_members m "
+            "JOIN users u ON u.name = m.username WHERE m.household = ?",
+            (name,)
+        ))
+
+
+STORAGE_BACKENDS = {
+    "json": (JSONStorage, DEFAULT_JSON_PATH),
+    "sqlite": (SQLiteStorage, DEFAULT_SQLITE_PATH),
+}
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def create_storage(backend, path=None):
+    """
+    Crea un motor de almacenamiento
+
+    Args:
+        backend: Nombre del motor ("json" o "sqlite")
+        path: Ruta del archivo de datos (opcional)
+
+    Returns:
+        Instancia del motor solicitado
+    """
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(f"Motor de almacenamiento desconocido: {backend}")
+    storage_class, default_path = STORAGE_BACKENDS[backend]
+    return storage_class(path or default_path)
+
+
+def get_storage():
+    """
+    Devuelve el motor de almacenamiento compartido por todo el proceso
+    """
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                _storage = create_storage(
+                    os.environ.get("H2OMIGA_STORAGE", "json"),
+                    os.environ.get("H2OMIGA_DATA_PATH")
+                )
+    return _storage
+
+
+def migrate(source, target):
+    """
+    Copia todos los hogares y usuarios de un motor de almacenamiento a otro
+    """
+    # Primero los hogares: los usuarios hacen referencia a ellos
+    for name in source.list_households():
+        household = source.get_household(name)
+        target.update_household(name, lambda current, household=household: household)
+    target.save_all(source.load_all())
+
+
+if __name__ == "__main__":
+    # Uso: python storage.py migrate user_data.json h2omiga.db
+    if len(sys.argv) != 4 or sys.argv[1] != "migrate":
+        print("Uso: python storage.py migrate <origen.json> <destino.db>")
+        sys.exit(1)
+    migrate(JSONStorage(sys.argv[2]), SQLiteStorage(sys.argv[3]))
+    print(f"Datos migrados de {sys.argv[2]} a {sys.argv[3]}")
@@ -0,0 +1,114 @@
+import random
+import unittest
+from datetime import date
+
+from consumption import daily_totals
+from city_stats import (
+    FenwickTree, RunningStats, CityStats, MAX_DAILY_LITERS, MIN_DAILY_LITERS, RESOLUTION,
+    WINDOW_DAYS, window_dates
+)
+
+
+class FenwickTreeTest(unittest.TestCase):
+
+    def test_prefix_and_kth_match_counts(self):
+        rng = random.Random(0)
+        counts = [rng.randint(0, 3) for _ in range(200)]
+        tree = FenwickTree.from_counts(counts)
+
+        for index in range(len(counts) + 1):
+            self.assertEqual(tree.prefix(index), sum(counts[:index]))
+
+        expanded = [i for i, count in enumerate(counts) for _ in range(count)]
+        for k, position in enumerate(expanded, start=1):
+            self.assertEqual(tree.kth(k), position)
+
+    def test_add_matches_from_counts(self):
+        rng = random.Random(1)
+        counts = [0] * 100
+        tree = FenwickTree(len(counts))
+        for _ in range(500):
+            index = rng.randrange(len(counts))
+            counts[index] += 1
+            tree.add(index, 1)
+        self.assertEqual(tree.tree, FenwickTree.from_counts(counts).tree)
+
+    def test_add_out_of_range(self):
+        tree = FenwickTree(10)
+        with self.assertRaises(IndexError):
+            tree.add(-1, 1)
+        with self.assertRaises(IndexError):
+            tree.add(10, 1)
+
+
+class RunningStatsTest(unittest.TestCase):
+
+    def test_negative_values(self):
+        stats = RunningStats.from_values([-20, 50])
+        self.assertAlmostEqual(stats.median(), 15)
+        self.assertAlmostEqual(stats.mean(), 15)
+
+        stats.add(-20)
+        self.assertAlmostEqual(stats.median(), -20)
+        stats.remove(-20)
+        self.assertAlmostEqual(stats.median(), 15)
+
+    def test_values_out_of_range_are_clamped(self):
+        stats = RunningStats()
+        stats.add(MIN_DAILY_LITERS - 500)
+        stats.add(MAX_DAILY_LITERS + 500)
+        self.assertAlmostEqual(stats.median(), (MIN_DAILY_LITERS + MAX_DAILY_LITERS) / 2)
+
+    def test_median_and_percentile_match_sorted(self):
+        rng = random.Random(2)
+        values = [round(rng.uniform(-20, 400), 1) for _ in range(301)]
+        stats = RunningStats.from_values(values)
+        ordered = sorted(values)
+
+        self.assertAlmostEqual(stats.median(), ordered[150], delta=RESOLUTION)
+        value = ordered[75]
+        below = sum(v < value for v in values)
+        equal = sum(v == value for v in values)
+        self.assertAlmostEqual(stats.percentile(value), (below + equal / 2) / len(values) * 100)
+
+
+class CityStatsTest(unittest.TestCase):
+
+    def test_update_with_negative_average(self):
+        stats = CityStats()
+        stats.update("fuga", "Lima", -20)
+        stats.update("fuga", "Lima", 15)
+        stats.update("otro", "Lima", 50)
+        self.assertEqual(stats._cities["Lima"].count, 2)
+        self.assertAlmostEqual(stats._cities["Lima"].median(), 32.5)
+
+        stats.update("fuga", "Lima", None)
+        self.assertEqual(stats._cities["Lima"].count, 1)
+
+    def test_update_record_uses_window_average(self):
+        today = date(2024, 3, 10)
+        stats = CityStats(today)
+        record = {"city": "Cusco", "consumption": {
+            "2024-03-10": {"shower": 1},
+            "2024-03-05": {"shower": 1},
+            "2024-01-01": {"shower": 1},
+        }}
+        stats.update_record("ana", record)
+        totals = daily_totals(record)
+        expected = (totals["2024-03-10"] + totals["2024-03-05"]) / WINDOW_DAYS
+        self.assertEqual(stats._users["ana"], ("Cusco", expected))
+
+        # Sin consumo en la ventana el usuario sale del índice
+        stats.update_record("ana", {"city": "Cusco", "consumption": {"2024-01-01": {"shower": 1}}})
+        self.assertNotIn("ana", stats._users)
+        self.assertEqual(stats._cities["Cusco"].count, 0)
+
+    def test_window_dates(self):
+        dates = window_dates(date(2024, 3, 1))
+        self.assertEqual(len(dates), WINDOW_DAYS)
+        self.assertEqual(dates[-1], "2024-03-01")
+        self.assertEqual(dates[0], "2024-02-24")
+
+
+if __name__ == "__main__":
+    unittest.main()
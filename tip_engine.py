@@ -0,0 +1,127 @@
+# Motor de recomendación de consejos de ahorro
+#
+# El catálogo se indexa una sola vez por nivel de consumo diario y, dentro de
+# cada nivel, por actividad, con los consejos de cada grupo ordenados de mayor
+# a menor ahorro nominal. Una consulta sólo mira, para cada actividad que el
+# usuario realmente practica, los primeros consejos de su grupo, así que su
+# costo no depende del tamaño del catálogo.
+#
+# El ahorro de cada consejo se estima con la fracción real del consumo que
+# corresponde a su actividad (consumption.activity_shares) en lugar de
+# suponer un 20%.
+
+import heapq
+import threading
+
+from utils import water_saving_tips, calculate_savings
+
+# Niveles de consumo diario: (límite superior exclusivo, nombre)
+CONSUMPTION_BANDS = [(50, "low"), (100, "moderate"), (float("inf"), "high")]
+BAND_NAMES = [name for _, name in CONSUMPTION_BANDS]
+
+# Consejos que se devuelven por recomendación (se rotan con tips_shown)
+RECOMMENDED_TIPS = 5
+
+
+def consumption_band(consumption):
+    """
+    Devuelve el nivel de un consumo diario, o None si no hay consumo
+    """
+    if consumption <= 0:
+        return None
+    for limit, name in CONSUMPTION_BANDS:
+        if consumption < limit:
+            return name
+
+
+def _is_factor(tip):
+    return tip["potential_savings"] <= 1
+
+
+class TipEngine:
+    """
+    Catálogo de consejos indexado por nivel de consumo y por actividad
+    """
+
+    def __init__(self, tips):
+        self.tips = {tip["id"]: tip for tip in tips}
+        self.by_band = {band: [] for band in BAND_NAMES}
+        # nivel -> actividad (None = consumo general) -> (factores, absolutos),
+        # cada lista de mayor a menor ahorro nominal
+        self._groups = {band: {} for band in BAND_NAMES}
+
+        for tip in sorted(tips, key=lambda tip: tip["id"]):
+            for band in tip.get("bands", BAND_NAMES):
+                if band not in self.by_band:
+                    raise ValueError(f"Nivel de consumo desconocido en el consejo {tip['id']}: {band}")
+                self.by_band[band].append(tip)
+                factors, absolutes = self._groups[band].setdefault(tip["activity"], ([], []))
+                (factors if _is_factor(tip) else absolutes).append(tip)
+
+        for groups in self._groups.values():
+            for factors, absolutes in groups.values():
+                factors.sort(key=lambda tip: -tip["potential_savings"])
+                absolutes.sort(key=lambda tip: -tip["potential_savings"])
+
+    def tips_for(self, consumption):
+        """
+        Devuelve los consejos del nivel de un consumo diario (lista compartida, no modificar)
+        """
+        band = consumption_band(consumption)
+        return self.by_band[band] if band else []
+
+    def recommend(self, consumption, shares=None, limit=RECOMMENDED_TIPS):
+        """
+        Devuelve los consejos con mayor ahorro estimado para un usuario
+
+        Args:
+            consumption: Consumo diario en litros
+            shares: Fracción del consumo de cada actividad {actividad: fracción};
+                sin historial se usan todas las actividades del nivel
+            limit: Número máximo de consejos
+
+        Returns:
+            Lista de consejos, de mayor a menor ahorro estimado
+        """
+        band = consumption_band(consumption)
+        if band is None:
+            return []
+        groups = self._groups[band]
+        shares = shares or None
+        if shares is None:
+            activities = groups.keys()
+        else:
+            activities = [None] + [activity for activity in shares if activity in groups]
+
+        # Dentro de un grupo el orden por ahorro estimado coincide con el
+        # nominal, así que basta con los primeros de cada lista
+        candidates = []
+        for activity in activities:
+            factors, absolutes = groups.get(activity, ((), ()))
+            candidates.extend(factors[:limit])
+            candidates.extend(absolutes[:limit])
+
+        # Ningún consejo para sus actividades: recomendar los del nivel completo
+        if not candidates and shares is not None:
+            return self.recommend(consumption, None, limit)
+
+        return heapq.nlargest(
+            limit, candidates,
+            key=lambda tip: (calculate_savings(tip, consumption, shares), -tip["id"])
+        )
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_tip_engine():
+    """
+    Devuelve el motor construido sobre el catálogo de utils.water_saving_tips
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = TipEngine(water_saving_tips)
+    return _engine
@@ -0,0 +1,164 @@
+# Acceso a los datos de los usuarios, sin dependencias de Streamlit
+#
+# Lo usan las pantallas de la aplicación (views/) y cualquier script que
+# necesite las mismas operaciones fuera de Streamlit; todas las lecturas y
+# escrituras pasan por el motor de almacenamiento configurado.
+
+import random
+from datetime import datetime, timedelta
+
+from city_stats import get_city_stats
+from consumption import (
+    day_liters, daily_totals, add_consumption, last_days, usage_summary,
+    activity_shares
+)
+from data import water_rates, DEFAULT_WATER_RATE
+from households import add_member_consumption, household_summary
+from metrics import ACTIVITY_USES, REGISTERED_LITERS, REGISTRATIONS, TIP_IMPRESSIONS
+from profiling import profiled
+from storage import get_storage, new_user_record
+from write_behind import get_write_behind
+
+# Función para cargar datos de usuario
+@profiled
+def load_user_data():
+    return get_storage().load_all()
+
+# Función para guardar datos de usuario
+@profiled
+def save_user_data(data):
+    get_storage().save_all(data)
+
+# Función para cargar los datos de un solo usuario
+@profiled
+def load_user(username):
+    return get_storage().get_user(username)
+
+# Función para cargar sólo los últimos días de un usuario (hasta hoy)
+@profiled
+def load_recent_user(username, days):
+    start = (datetime.now().date() - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+    return get_storage().get_user_since(username, start)
+
+# Función para modificar un usuario sin perder cambios de otras sesiones
+@profiled
+def update_user(username, update):
+    return get_storage().update_user(username, update)
+
+# Función para crear o actualizar usuario
+def create_or_update_user(name, city):
+    def update(user):
+        if user is None:
+            return new_user_record(city)
+        user["city"] = city
+        return user
+    
+    record = update_user(name, update)
+    get_city_stats().update_record(name, record)
+    return name
+
+# Función para registrar consumo
+@profiled
+def register_consumption(username, activities):
+    today = datetime.now().strftime("%Y-%m-%d")
+    total_consumption = day_liters(activities)
+    
+    def update(user):
+        # Actualiza el detalle del día y los totales precalculados
+        add_consumption(user, today, activities)
+        return user
+    
+    record = update_user(username, update)
+    get_city_stats().update_record(username, record)
+    
+    # Los totales del hogar se actualizan sólo con lo que se acaba de registrar
+    # (si falla, household_summary los recalcula)
+    if record.get("household"):
+        add_member_consumption(record["household"], username, {today: total_consumption})
+    
+    city = record.get("city", "Lima")
+    REGISTRATIONS.inc(city=city)
+    REGISTERED_LITERS.inc(total_consumption, city=city)
+    for activity, quantity in activities.items():
+        if quantity > 0:
+            ACTIVITY_USES.inc(quantity, activity=activity, city=city)
+    return total_consumption
+
+# Función para elegir un consejo no mostrado antes y guardarlo en tips_shown
+# (escritura diferida: dibujar el panel no escribe en disco)
+@profiled
+def record_tip_shown(username, tips):
+    queue = get_write_behind()
+    user = queue.pending_view(username, load_recent_user(username, 1)) or {}
+    
+    # Mostrar solo tips que no han sido mostrados antes
+    shown_tips = user.get("tips_shown", [])
+    new_tips = [tip for tip in tips if tip["id"] not in shown_tips]
+    
+    # Si todos los tips ya se han mostrado, reiniciar
+    reset = not new_tips
+    if reset:
+        new_tips = tips
+    
+    # Seleccionar un tip aleatorio de los nuevos
+    tip = random.choice(new_tips)
+    
+    def update(user):
+        # Guardar que se ha mostrado este tip
+        if reset:
+            user["tips_shown"] = []
+        user.setdefault("tips_shown", []).append(tip["id"])
+        return user
+    
+    queue.enqueue(username, update)
+    TIP_IMPRESSIONS.inc(tip_id=tip["id"])
+    return tip
+
+# Función para obtener consumo total por día
+@profiled
+def get_daily_consumption(username):
+    user = load_user(username)
+    
+    if user is None:
+        return {}
+    
+    return daily_totals(user)
+
+# Función para obtener el consumo de hoy (None si aún no hay registros)
+@profiled
+def get_today_consumption(username):
+    today = datetime.now().strftime("%Y-%m-%d")
+    return daily_totals(load_recent_user(username, 1) or {}).get(today)
+
+# Función para obtener consumo semanal
+@profiled
+def get_weekly_consumption(username):
+    return last_days(load_recent_user(username, 7) or {}, 7)
+
+# Función para obtener el resumen semanal (totales, límite y costo)
+@profiled
+def get_weekly_summary(username):
+    return usage_summary(load_recent_user(username, 7) or {}, 7)
+
+# Función para obtener qué fracción del consumo de los últimos 30 días corresponde a cada actividad
+@profiled
+def get_activity_shares(username):
+    return activity_shares(load_recent_user(username, 30) or {}, 30)
+
+# Función para obtener la ciudad del usuario
+def get_user_city(username):
+    return (load_recent_user(username, 1) or {}).get("city", "Lima")
+
+# Función para obtener la tarifa de agua de la ciudad del usuario
+def get_user_rate(username):
+    return water_rates.get(get_user_city(username), DEFAULT_WATER_RATE)
+
+# Función para obtener el hogar del usuario (None si no pertenece a ninguno)
+def get_user_household(username):
+    return (load_recent_user(username, 1) or {}).get("household")
+
+# Función para obtener el resumen de los últimos 30 días del hogar del usuario
+@profiled
+def get_household_summary(username):
+    household = get_user_household(username)
+    return household_summary(household) if household else None
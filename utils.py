@@ -1,101 +1,120 @@
 import random
 
 # Lista de consejos para ahorro de agua
+# "bands" indica en qué niveles de consumo diario se recomienda cada consejo
+# (ver tip_engine.CONSUMPTION_BANDS)
 water_saving_tips = [
     {
         "id": 1,
         "description": "Cierra el grifo mientras te cepillas los dientes. Puedes ahorrar hasta 12 litros por minuto.",
         "potential_savings": 12,
-        "activity": "brush_teeth"
+        "activity": "brush_teeth",
+        "bands": ["moderate"]
     },
     {
         "id": 2,
         "description": "Instala cabezales de ducha de bajo flujo para reducir el consumo de agua hasta en un 50%.",
         "potential_savings": 0.5,  # Factor de reducción
-        "activity": "shower"
+        "activity": "shower",
+        "bands": ["high"]
     },
     {
         "id": 3,
         "description": "Repara grifos que gotean. Un grifo que gotea puede desperdiciar hasta 20 litros al día.",
         "potential_savings": 20,
-        "activity": None  # Aplica a consumo general
+        "activity": None,  # Aplica a consumo general
+        "bands": ["low"]
     },
     {
         "id": 4,
         "description": "Lava los platos en una tina llena de agua en lugar de hacerlo con el grifo abierto.",
         "potential_savings": 0.6,  # Factor de reducción
-        "activity": "wash_dishes"
+        "activity": "wash_dishes_by_hand",
+        "bands": ["moderate"]
     },
     {
         "id": 5,
         "description": "Utiliza la lavadora sólo con carga completa para maximizar la eficiencia del agua.",
         "potential_savings": 0.3,  # Factor de reducción
-        "activity": "washing_machine"
+        "activity": "washing_machine",
+        "bands": ["moderate", "high"]
     },
     {
         "id": 6,
         "description": "Recoge agua de lluvia para regar las plantas.",
         "potential_savings": 0.8,  # Factor de reducción
-        "activity": "water_plants"
+        "activity": "water_plants",
+        "bands": ["low"]
     },
     {
         "id": 7,
         "description": "Toma duchas más cortas. Reducir tu ducha en 2 minutos puede ahorrar hasta 20 litros.",
         "potential_savings": 20,
-        "activity": "shower"
+        "activity": "shower",
+        "bands": ["high"]
     },
     {
         "id": 8,
         "description": "Utiliza un sistema de doble descarga en el inodoro para ahorrar agua en cada uso.",
         "potential_savings": 0.5,  # Factor de reducción
-        "activity": "toilet"
+        "activity": "toilet",
+        "bands": ["moderate", "high"]
     },
     {
         "id": 9,
         "description": "No uses el inodoro como papelera. Cada descarga innecesaria gasta entre 6 y 10 litros.",
         "potential_savings": 8,
-        "activity": "toilet"
+        "activity": "toilet",
+        "bands": ["high"]
     },
     {
         "id": 10,
         "description": "Lava frutas y verduras en un recipiente con agua en lugar de bajo el grifo corriente.",
         "potential_savings": 5,
-        "activity": "cooking"
+        "activity": "cooking",
+        "bands": ["low", "moderate"]
     }
 ]
 
 def get_water_saving_tips(consumption):
     """
     Devuelve consejos relevantes basados en el consumo actual
+    (todos los del nivel de consumo, ver tip_engine)
     """
-    if consumption <= 0:
-        return []
+    from tip_engine import get_tip_engine
     
-    # Si el consumo es bajo, mostrar consejos generales
-    if consumption < 50:
-        return [tip for tip in water_saving_tips if tip["id"] in [3, 6, 10]]
-    
-    # Si el consumo es moderado
-    elif consumption < 100:
-        return [tip for tip in water_saving_tips if tip["id"] in [1, 4, 5, 8, 10]]
-    
-    # Si el consumo es alto
-    else:
-        return [tip for tip in water_saving_tips if tip["id"] in [2, 5, 7, 8, 9]]
+    return get_tip_engine().tips_for(consumption)
 
-def calculate_savings(tip, current_consumption):
+def calculate_savings(tip, current_consumption, shares=None):
     """
     Calcula el ahorro potencial basado en el tip y el consumo actual
+    
+    Args:
+        tip: Consejo de ahorro
+        current_consumption: Consumo diario en litros
+        shares: Fracción del consumo de cada actividad {actividad: fracción},
+            ver consumption.activity_shares (opcional)
+    
+    Returns:
+        Ahorro estimado en litros al día
     """
-    # Si el tip tiene un valor fijo de ahorro
+    if tip["activity"] is None:  # Aplica al consumo general
+        activity_consumption = current_consumption
+    elif shares:
+        # Parte del consumo que corresponde realmente a esta actividad
+        activity_consumption = current_consumption * shares.get(tip["activity"], 0)
+    else:
+        # Sin historial, asumimos que el 20% del consumo viene de esta actividad
+        activity_consumption = current_consumption * 0.2
+    
     if tip["potential_savings"] <= 1:  # Es un factor de reducción
-        if tip["activity"] is None:  # Aplica al consumo general
-            return current_consumption * tip["potential_savings"]
-        else:
-            # Asumimos que el 20% del consumo viene de esta actividad como estimación
-            return (current_consumption * 0.2) * tip["potential_savings"]
-    else:  # Es un valor absoluto de ahorro
-        return tip["potential_savings"]
+        return activity_consumption * tip["potential_savings"]
+    
+    # Es un valor absoluto de ahorro: no más de lo que consume la actividad
+    # (o el día completo, si es un consejo general)
+    if tip["activity"] is None or shares:
+        return min(tip["potential_savings"], max(activity_consumption, 0))
+    return tip["potential_savings"]
 
 def calculate_cost_savings(water_savings, city):
     """
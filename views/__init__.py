@@ -0,0 +1 @@
+# Pantallas de la aplicación (introducción, registro, bienvenida y panel)
@@ -0,0 +1,153 @@
+# Elementos compartidos por las secciones del panel principal
+#
+# Agregados del usuario memorizados durante la ejecución actual del script,
+# el gráfico de consumo semanal y los consejos de ahorro.
+
+import streamlit as st
+
+from figure_cache import cached_figure
+from profiling import profiled
+from users import (
+    load_recent_user, record_tip_shown, get_daily_consumption, get_today_consumption,
+    get_weekly_consumption, get_weekly_summary, get_user_city, get_user_rate, get_activity_shares, get_household_summary
+)
+from tip_engine import get_tip_engine
+from utils import calculate_savings, calculate_cost_savings
+
+# Agregados por usuario que se calculan una sola vez por ejecución del script
+USER_AGGREGATES = {
+    "daily": get_daily_consumption,
+    "today": get_today_consumption,
+    "weekly": get_weekly_consumption,
+    "weekly_summary": get_weekly_summary,
+    "city": get_user_city,
+    "rate": get_user_rate,
+    "activity_shares": get_activity_shares,
+    "household_summary": get_household_summary,
+}
+
+# Función para obtener un agregado del usuario, memorizado durante la ejecución actual
+def get_user_aggregate(kind, username):
+    memo = st.session_state.setdefault("_aggregates", {})
+    key = (kind, username)
+    
+    if key not in memo:
+        memo[key] = USER_AGGREGATES[kind](username)
+    
+    return memo[key]
+
+# Función para descartar los agregados de un usuario tras modificar sus datos
+def invalidate_user_aggregates(username):
+    memo = st.session_state.get("_aggregates", {})
+    
+    for key in [key for key in memo if key[1] == username]:
+        del memo[key]
+
+# Función para construir el gráfico de consumo semanal
+@profiled
+def build_weekly_chart(weekly_consumption):
+    # pandas y plotly se importan al construir el primer gráfico, no al abrir la aplicación
+    import pandas as pd
+    import plotly.express as px
+    
+    # Convertir fechas a formato más legible
+    days = {
+        "Monday": "Lunes",
+        "Tuesday": "Martes",
+        "Wednesday": "Miércoles",
+        "Thursday": "Jueves",
+        "Friday": "Viernes",
+        "Saturday": "Sábado",
+        "Sunday": "Domingo"
+    }
+    
+    df = pd.DataFrame({
+        "Fecha": weekly_consumption.keys(),
+        "Consumo (litros)": weekly_consumption.values()
+    })
+    
+    # Convertir fechas a objetos datetime
+    df["Fecha"] = pd.to_datetime(df["Fecha"])
+    
+    # Añadir el día de la semana
+    df["Día"] = df["Fecha"].dt.day_name().map(days)
+    
+    # Ordenar por fecha
+    df = df.sort_values("Fecha")
+    
+    # Crear gráfico
+    fig = px.bar(
+        df, 
+        x="Día", 
+        y="Consumo (litros)",
+        color="Consumo (litros)",
+        color_continuous_scale=["#A3E5FA", "#0097CE", "#005C85"],
+        labels={"Consumo (litros)": "Consumo de agua (litros)"},
+        title="Consumo de agua semanal"
+    )
+    
+    # Añadir línea de límite en 100 litros
+    fig.add_hline(
+        y=100, 
+        line_dash="dash", 
+        line_color="red", 
+        annotation_text="Límite recomendado", 
+        annotation_position="bottom right"
+    )
+    
+    return fig
+
+# Función para mostrar gráfico de consumo semanal
+def show_weekly_chart(username):
+    weekly_consumption = get_user_aggregate("weekly", username)
+    fig = cached_figure(build_weekly_chart, weekly_consumption)
+    st.plotly_chart(fig, use_container_width=True)
+
+# Función para mostrar consejos
+@profiled
+def show_tips(username, daily_consumption):
+    if load_recent_user(username, 1) is None:
+        return
+        
+    # Consejos con mayor ahorro según el peso real de cada actividad en su consumo
+    shares = get_user_aggregate("activity_shares", username)
+    tips = get_tip_engine().recommend(daily_consumption, shares)
+    
+    if not tips:
+        return
+    
+    # Obtener la ciudad del usuario para calcular ahorro en dinero
+    city = get_user_aggregate("city", username)
+    
+    # Elegir un tip que no se haya mostrado antes y guardarlo
+    tip = record_tip_shown(username, tips)
+    
+    # Calcular ahorro potencial en litros
+    potential_savings_liters = calculate_savings(tip, daily_consumption, shares)
+    
+    # Calcular ahorro potencial en dinero
+    daily_cost_savings, monthly_cost_savings = calculate_cost_savings(potential_savings_liters, city)
+    
+    # Obtener tarifa de agua actual
+    water_rate = get_user_aggregate("rate", username)
+    
+    st.info(f"💧 **Consejo de ahorro:** {tip['description']}")
+    
+    # Mostrar información de ahorro
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.success(f"""
+        **Ahorro de agua:**
+        - {potential_savings_liters:.1f} litros al día
+        - {(potential_savings_liters * 30):.1f} litros al mes
+        """)
+    
+    with col2:
+        st.success(f"""
+        **Ahorro económico:**
+        - S/ {daily_cost_savings:.2f} al día
+        - S/ {monthly_cost_savings:.2f} al mes
+        
+        _Basado en tarifa de agua: S/ {water_rate:.2f} por m³_
+        """)
@@ -0,0 +1,31 @@
+from importlib import import_module
+
+import streamlit as st
+
+# Secciones del panel principal: nombre visible -> módulo con su función render()
+DASHBOARD_SECTIONS = {
+    "📝 Registrar consumo": "views.tabs.register",
+    "📊 Visualizar datos": "views.tabs.charts",
+    "🔍 Comparativa": "views.tabs.comparison",
+    "🏠 Hogar": "views.tabs.household",
+    "👣 Huella hídrica": "views.tabs.footprint",
+    "🎯 Desafíos": "views.tabs.challenges",
+    "🧠 Quiz del agua": "views.tabs.quiz",
+    "🛠️ Herramientas": "views.tabs.tools",
+}
+
+# Panel principal
+def render():
+    st.title(f"💧 H2Omiga - Panel de {st.session_state.user}")
+    
+    # Navegación entre secciones: a diferencia de st.tabs, sólo se ejecuta la sección visible
+    section = st.radio(
+        "Sección",
+        list(DASHBOARD_SECTIONS),
+        horizontal=True,
+        key="dashboard_section",
+        label_visibility="collapsed"
+    )
+    
+    # Sólo se importa el módulo de la sección visible
+    import_module(DASHBOARD_SECTIONS[section]).render()
@@ -0,0 +1,85 @@
+import random
+
+import streamlit as st
+
+from assets.water_facts import water_facts
+
+# Pantalla de introducción
+def render():
+    # Definición de frases para la introducción
+    fact1 = random.choice(water_facts)
+    remaining_facts = [f for f in water_facts if f != fact1]
+    fact2 = random.choice(remaining_facts)
+    
+    intro_content = [
+        {
+            "title": "💧 El agua es vida",
+            "text": "El agua es un recurso vital pero limitado en nuestro planeta.",
+            "color": "blue"
+        },
+        {
+            "title": "⚠️ Crisis hídrica",
+            "text": fact1,
+            "color": "orange"
+        },
+        {
+            "title": "🏙️ Ciudades sin agua",
+            "text": fact2,
+            "color": "red"
+        },
+        {
+            "title": "💡 Soluciones individuales",
+            "text": "Cada persona puede hacer la diferencia. Pequeñas acciones diarias pueden generar un gran impacto en la conservación del agua.",
+            "color": "green"
+        },
+        {
+            "title": "📊 H2Omiga",
+            "text": "Esta aplicación te ayudará a monitorear y reducir tu consumo diario de agua, ahorrando dinero y contribuyendo a la sostenibilidad del planeta.",
+            "color": "blue"
+        }
+    ]
+    
+    current_page = st.session_state.intro_page
+    
+    # Si ya pasamos por todas las páginas de introducción
+    if current_page >= len(intro_content):
+        st.session_state.step = 'register'
+        st.rerun()
+    
+    current = intro_content[current_page]
+    
+    # Título centrado
+    st.markdown(f"<h1 style='text-align: center; font-size: 2.5rem;'>{current['title']}</h1>", unsafe_allow_html=True)
+    
+    # Texto centrado y con estilo en un contenedor con color de fondo según el tema
+    color_bg = f"rgba({','.join(['0', '0', '255', '0.1'])});" if current['color'] == 'blue' else \
+               f"rgba({','.join(['255', '165', '0', '0.1'])});" if current['color'] == 'orange' else \
+               f"rgba({','.join(['255', '0', '0', '0.1'])});" if current['color'] == 'red' else \
+               f"rgba({','.join(['0', '128', '0', '0.1'])});" if current['color'] == 'green' else \
+               "rgba(0,0,0,0.05);"
+    
+    st.markdown(f"""
+    <div style='text-align: center; margin: 40px 0; padding: 30px; border-radius: 15px; background-color: {color_bg}; box-shadow: 0 4px 6px rgba(0,0,0,0.1);'>
+        <h2 style='font-size: 1.8rem;'>{current["text"]}</h2>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Mostrar el número de página actual
+    st.markdown(f"""
+    <div style='text-align: center; margin-bottom: 20px;'>
+        {current_page + 1} de {len(intro_content)}
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Botones de navegación
+    col1, col2, col3 = st.columns([1, 2, 1])
+    
+    with col2:
+        if current_page == len(intro_content) - 1:
+            if st.button("Comenzar aplicación", type="primary", use_container_width=True):
+                st.session_state.intro_page += 1
+                st.rerun()
+        else:
+            if st.button("Siguiente", type="primary", use_container_width=True):
+                st.session_state.intro_page += 1
+                st.rerun()
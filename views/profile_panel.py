@@ -0,0 +1,21 @@
+import streamlit as st
+
+# Panel de depuración: perfil de la ejecución actual del script
+def render(profile):
+    with st.sidebar.expander("⏱️ Perfil de esta ejecución", expanded=True):
+        st.metric("Duración de la ejecución", f"{profile.elapsed() * 1000:.1f} ms")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Bytes leídos", f"{profile.bytes['read']:,}")
+        with col2:
+            st.metric("Bytes escritos", f"{profile.bytes['written']:,}")
+        
+        for name, count in profile.events.items():
+            st.write(f"**{name}:** {count}")
+        
+        rows = profile.rows()
+        if rows:
+            st.table(rows)
+        else:
+            st.write("No se llamó a ninguna función instrumentada.")
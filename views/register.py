@@ -0,0 +1,32 @@
+import streamlit as st
+
+from users import create_or_update_user
+from views.common import invalidate_user_aggregates
+
+# Pantalla de registro
+def render():
+    st.title("💧 Registro en H2Omiga")
+    
+    with st.form("registro_usuario"):
+        name = st.text_input("Nombre")
+        
+        # Lista de ciudades de Perú
+        cities = [
+            "Lima", "Arequipa", "Trujillo", "Chiclayo", "Piura", 
+            "Iquitos", "Cusco", "Huancayo", "Tacna", "Pucallpa",
+            "Chimbote", "Juliaca", "Ica", "Cajamarca", "Sullana",
+            "Ayacucho", "Huánuco", "Puno", "Tarapoto", "Tumbes"
+        ]
+        
+        city = st.selectbox("Ciudad", cities)
+        
+        submitted = st.form_submit_button("Registrarme")
+        
+        if submitted:
+            if name:
+                st.session_state.user = create_or_update_user(name, city)
+                invalidate_user_aggregates(name)
+                st.session_state.step = 'welcome'
+                st.rerun()
+            else:
+                st.error("Por favor, ingresa tu nombre para continuar.")
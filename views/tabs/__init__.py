@@ -0,0 +1 @@
+# Secciones del panel principal, una por módulo con su función render()
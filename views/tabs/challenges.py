@@ -0,0 +1,139 @@
+import streamlit as st
+
+from data import water_challenges
+from metrics import CHALLENGE_ACTIONS
+
+# Acciones de los desafíos: como callbacks se aplican antes de volver a
+# dibujar el fragmento, sin necesidad de st.rerun()
+def accept_challenge(challenge_id):
+    st.session_state.active_challenges.append(challenge_id)
+    CHALLENGE_ACTIONS.inc(action="accepted")
+
+def complete_challenge(challenge_id):
+    st.session_state.active_challenges.remove(challenge_id)
+    st.session_state.completed_challenges.append(challenge_id)
+    CHALLENGE_ACTIONS.inc(action="completed")
+
+# Sección: desafíos
+@st.fragment
+def render():
+    st.header("Desafíos para ahorrar agua")
+    
+    st.markdown("""
+    ¡Demuestra tu compromiso con la conservación del agua aceptando estos desafíos!
+    Cada desafío te ayudará a reducir tu consumo de agua y desarrollar hábitos más sostenibles.
+    """)
+    
+    # Inicializar estado para los desafíos en la sesión
+    if 'active_challenges' not in st.session_state:
+        st.session_state.active_challenges = []
+    
+    if 'completed_challenges' not in st.session_state:
+        st.session_state.completed_challenges = []
+    
+    # Espacio para desafíos activos
+    if st.session_state.active_challenges:
+        st.subheader("Tus desafíos activos")
+        
+        for challenge_id in st.session_state.active_challenges:
+            # Encontrar el desafío correspondiente
+            challenge = next((c for c in water_challenges if c["id"] == challenge_id), None)
+            
+            if challenge:
+                with st.expander(f"{challenge['name']} ({challenge['difficulty']})"):
+                    st.write(challenge["description"])
+                    st.progress(0.5)  # Progreso ficticio por ahora
+                    
+                    col1, col2 = st.columns([3, 1])
+                    with col1:
+                        st.write(f"Meta: Ahorrar {challenge['target']} litros")
+                        st.write(f"Duración: {challenge['duration']} días")
+                    
+                    with col2:
+                        st.button("Completado", key=f"complete_{challenge_id}",
+                                  on_click=complete_challenge, args=(challenge_id,))
+    
+    # Mostrar desafíos disponibles
+    st.subheader("Desafíos disponibles")
+    
+    # Filtrar desafíos que no están activos ni completados
+    available_challenges = [c for c in water_challenges 
+                           if c["id"] not in st.session_state.active_challenges 
+                           and c["id"] not in st.session_state.completed_challenges]
+    
+    # Agrupar por dificultad
+    easy_challenges = [c for c in available_challenges if c["difficulty"] == "fácil"]
+    medium_challenges = [c for c in available_challenges if c["difficulty"] == "medio"]
+    hard_challenges = [c for c in available_challenges if c["difficulty"] == "difícil"]
+    extreme_challenges = [c for c in available_challenges if c["difficulty"] == "extremo"]
+    
+    # Crear tabs para diferentes niveles de dificultad
+    if available_challenges:
+        diff_tab1, diff_tab2, diff_tab3, diff_tab4 = st.tabs(["Fácil", "Medio", "Difícil", "Extremo"])
+        
+        with diff_tab1:
+            if easy_challenges:
+                for challenge in easy_challenges:
+                    col1, col2 = st.columns([4, 1])
+                    with col1:
+                        st.markdown(f"**{challenge['name']}**")
+                        st.write(challenge["description"])
+                        st.write(f"Meta: Ahorrar {challenge['target']} litros en {challenge['duration']} días")
+                    with col2:
+                        st.button("Aceptar", key=f"accept_{challenge['id']}",
+                                  on_click=accept_challenge, args=(challenge["id"],))
+            else:
+                st.write("No hay desafíos disponibles de nivel fácil.")
+        
+        with diff_tab2:
+            if medium_challenges:
+                for challenge in medium_challenges:
+                    col1, col2 = st.columns([4, 1])
+                    with col1:
+                        st.markdown(f"**{challenge['name']}**")
+                        st.write(challenge["description"])
+                        st.write(f"Meta: Ahorrar {challenge['target']} litros en {challenge['duration']} días")
+                    with col2:
+                        st.button("Aceptar", key=f"accept_{challenge['id']}",
+                                  on_click=accept_challenge, args=(challenge["id"],))
+            else:
+                st.write("No hay desafíos disponibles de nivel medio.")
+        
+        with diff_tab3:
+            if hard_challenges:
+                for challenge in hard_challenges:
+                    col1, col2 = st.columns([4, 1])
+                    with col1:
+                        st.markdown(f"**{challenge['name']}**")
+                        st.write(challenge["description"])
+                        st.write(f"Meta: Ahorrar {challenge['target']} litros en {challenge['duration']} días")
+                    with col2:
+                        st.button("Aceptar", key=f"accept_{challenge['id']}",
+                                  on_click=accept_challenge, args=(challenge["id"],))
+            else:
+                st.write("No hay desafíos disponibles de nivel difícil.")
+        
+        with diff_tab4:
+            if extreme_challenges:
+                for challenge in extreme_challenges:
+                    col1, col2 = st.columns([4, 1])
+                    with col1:
+                        st.markdown(f"**{challenge['name']}**")
+                        st.write(challenge["description"])
+                        st.write(f"Meta: Ahorrar {challenge['target']} litros en {challenge['duration']} días")
+                    with col2:
+                        st.button("Aceptar", key=f"accept_{challenge['id']}",
+                                  on_click=accept_challenge, args=(challenge["id"],))
+            else:
+                st.write("No hay desafíos disponibles de nivel extremo.")
+    else:
+        st.info("¡Felicidades! Has aceptado todos los desafíos disponibles.")
+    
+    # Desafíos completados
+    if st.session_state.completed_challenges:
+        st.subheader("Desafíos completados")
+        
+        for challenge_id in st.session_state.completed_challenges:
+            challenge = next((c for c in water_challenges if c["id"] == challenge_id), None)
+            if challenge:
+                st.success(f"✅ {challenge['name']} - Ahorraste aproximadamente {challenge['target']} litros de agua")
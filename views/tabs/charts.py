@@ -0,0 +1,50 @@
+import streamlit as st
+
+from views.common import get_user_aggregate, show_weekly_chart, show_tips
+
+# Sección: visualizar datos
+def render():
+    st.header("Visualización de tu consumo de agua")
+    
+    # Mostrar gráfico semanal
+    show_weekly_chart(st.session_state.user)
+    
+    # Mostrar estadísticas (totales, promedio, días sobre el límite y costo)
+    weekly_summary = get_user_aggregate("weekly_summary", st.session_state.user)
+    total_weekly = weekly_summary["total_liters"]
+    daily_avg = weekly_summary["daily_average"]
+    water_rate = weekly_summary["rate"]
+    weekly_cost = weekly_summary["cost"]
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("Consumo semanal", f"{total_weekly:.1f} litros")
+    
+    with col2:
+        st.metric("Promedio diario", f"{daily_avg:.1f} litros")
+    
+    with col3:
+        # Días sobre el límite
+        st.metric("Días sobre el límite", f"{weekly_summary['days_over_limit']} de 7")
+    
+    # Mostrar costo en soles
+    st.subheader("Costo del consumo de agua")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("Costo semanal", f"S/ {weekly_cost:.2f}")
+    
+    with col2:
+        st.metric("Costo mensual estimado", f"S/ {(weekly_cost * 4):.2f}")
+    
+    with col3:
+        st.metric("Tarifa aplicada", f"S/ {water_rate:.2f} por m³")
+    
+    # Si hay datos de hoy, mostrar consejos
+    today_total = get_user_aggregate("today", st.session_state.user)
+    
+    if today_total is not None:
+        st.subheader("Consejos para ahorrar agua")
+        show_tips(st.session_state.user, today_total)
@@ -0,0 +1,159 @@
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from city_stats import get_city_stats, WINDOW_DAYS
+from figure_cache import cached_figure
+from profiling import profiled
+from views.common import get_user_aggregate
+
+# Función para construir el gráfico comparativo de consumo diario
+@profiled
+def build_comparison_chart(city, daily_avg, city_avg, national_avg):
+    fig = go.Figure()
+    
+    # Añadir barras
+    fig.add_trace(go.Bar(
+        x=['Tu consumo', f'Promedio en {city}', 'Promedio nacional'],
+        y=[daily_avg, city_avg, national_avg],
+        marker_color=['#1E88E5', '#FFA726', '#66BB6A']
+    ))
+    
+    # Añadir línea de límite recomendado
+    fig.add_shape(
+        type="line",
+        x0=-0.5,
+        y0=100,
+        x1=2.5,
+        y1=100,
+        line=dict(
+            color="Red",
+            width=2,
+            dash="dash",
+        ),
+        name="Límite recomendado"
+    )
+    
+    fig.add_annotation(
+        x=2,
+        y=105,
+        text="Límite recomendado (100L)",
+        showarrow=False,
+        font=dict(color="red")
+    )
+    
+    fig.update_layout(
+        title="Consumo diario promedio (litros)",
+        xaxis_title="",
+        yaxis_title="Litros por día",
+        height=400
+    )
+    
+    return fig
+
+# Sección: comparativa
+def render():
+    st.header("Comparativa de consumo de agua")
+    
+    city = get_user_aggregate("city", st.session_state.user)
+    
+    # Promedio diario del usuario en los últimos 7 días, el mismo que usa el
+    # índice de city_stats para los promedios y el percentil
+    weekly_consumption = get_user_aggregate("weekly", st.session_state.user)
+    daily_avg = sum(weekly_consumption.values()) / WINDOW_DAYS if weekly_consumption else 0
+    
+    # Consumo promedio de la ciudad y nacional según los usuarios registrados
+    # (con pocos usuarios se usan los promedios de referencia)
+    city_stats = get_city_stats()
+    city_summary = city_stats.city_summary(city)
+    national_summary = city_stats.national_summary()
+    city_avg = city_summary["mean"]
+    national_avg = national_summary["mean"]
+    
+    # Comparación nacional
+    st.subheader("Tu consumo comparado con el promedio")
+    st.caption(f"Promedio diario de los últimos {WINDOW_DAYS} días.")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        fig = cached_figure(build_comparison_chart, city, daily_avg, city_avg, national_avg)
+        st.plotly_chart(fig, use_container_width=True)
+        
+        # Origen de los promedios
+        for label, summary in ((city, city_summary), ("Perú", national_summary)):
+            if summary["live"]:
+                st.caption(f"{label}: promedio de {summary['count']} usuarios de H2Omiga con consumo "
+                           f"en los últimos {WINDOW_DAYS} días (mediana {summary['median']:.1f} L/día).")
+            else:
+                st.caption(f"{label}: promedio de referencia (aún hay pocos usuarios registrados).")
+    
+    with col2:
+        # Calcular porcentajes (sin promedio positivo no hay con qué comparar)
+        vs_city = (daily_avg / city_avg) * 100 - 100 if city_avg > 0 else None
+        vs_national = (daily_avg / national_avg) * 100 - 100 if national_avg > 0 else None
+        vs_recommended = (daily_avg / 100) * 100 - 100
+        
+        st.markdown(f"""
+        ### Tu posición relativa
+        
+        #### Respecto a tu ciudad ({city}):
+        """)
+        
+        if vs_city is None:
+            st.info(f"📊 Aún no hay un promedio de consumo válido para {city}.")
+        elif vs_city > 0:
+            st.error(f"⚠️ **Consumes {abs(vs_city):.1f}% más** que el promedio de habitantes en {city}.")
+        elif vs_city < 0:
+            st.success(f"✅ **Consumes {abs(vs_city):.1f}% menos** que el promedio de habitantes en {city}.")
+        else:
+            st.info(f"📊 Tu consumo es igual al promedio de habitantes en {city}.")
+        
+        # Percentil del usuario entre los usuarios de su ciudad
+        rank = city_stats.percentile(st.session_state.user)
+        if rank is not None:
+            st.metric(f"Tu percentil en {city}", f"{rank['percentile']:.0f}",
+                      help=f"Porcentaje de usuarios de tu ciudad cuyo promedio diario de los últimos {WINDOW_DAYS} días es menor al tuyo")
+            st.caption(f"Consumes más que el {rank['percentile']:.0f}% de los "
+                       f"{rank['count']} usuarios de H2Omiga en {city}.")
+        
+        st.markdown("#### Respecto al promedio nacional:")
+        
+        if vs_national is None:
+            st.info("📊 Aún no hay un promedio nacional de consumo válido.")
+        elif vs_national > 0:
+            st.error(f"⚠️ **Consumes {abs(vs_national):.1f}% más** que el promedio nacional.")
+        elif vs_national < 0:
+            st.success(f"✅ **Consumes {abs(vs_national):.1f}% menos** que el promedio nacional.")
+        else:
+            st.info(f"📊 Tu consumo es igual al promedio nacional.")
+        
+        st.markdown("#### Respecto al límite recomendado (100L):")
+        
+        if vs_recommended > 0:
+            st.error(f"⚠️ **Consumes {abs(vs_recommended):.1f}% más** que el límite recomendado.")
+        elif vs_recommended < 0:
+            st.success(f"✅ **Consumes {abs(vs_recommended):.1f}% menos** que el límite recomendado.")
+        else:
+            st.info(f"📊 Tu consumo es igual al límite recomendado.")
+    
+    # Ranking por ciudades
+    st.subheader("Ranking de consumo por ciudades")
+    
+    cities_ranking = sorted(city_stats.city_averages().items(), key=lambda x: x[1])
+    
+    df_ranking = pd.DataFrame(cities_ranking, columns=['Ciudad', 'Consumo diario (litros)'])
+    
+    # Resaltar la ciudad del usuario
+    def highlight_city(row):
+        if row.Ciudad == city:
+            return ['background-color: rgba(30, 136, 229, 0.2)'] * len(row)
+        return [''] * len(row)
+    
+    st.dataframe(
+        df_ranking.style.apply(highlight_city, axis=1),
+        use_container_width=True,
+        height=400
+    )
+    
+    st.info(f"💡 **Dato interesante:** Lima es la segunda ciudad más grande del mundo ubicada en un desierto, después de El Cairo. Por eso, la conservación del agua es especialmente crucial.")
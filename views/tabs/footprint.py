@@ -0,0 +1,342 @@
+import plotly.graph_objects as go
+import streamlit as st
+
+from data import NATIONAL_AVG_CONSUMPTION
+from figure_cache import cached_figure
+from profiling import profiled
+from views.common import get_user_aggregate
+from water_footprint import PRODUCTS_CATEGORY, get_footprint_model
+
+# Función para construir el gráfico de distribución de la huella hídrica
+@profiled
+def build_footprint_pie(direct_water_use, daily_food_footprint, total_product_footprint):
+    fig = go.Figure()
+    
+    # Preparar datos para el gráfico de pie
+    labels = ["Uso directo", "Alimentos", "Productos"]
+    values = [direct_water_use, daily_food_footprint, total_product_footprint]
+    colors = ["#1E88E5", "#FFA726", "#66BB6A"]
+    
+    fig.add_trace(go.Pie(
+        labels=labels,
+        values=values,
+        marker=dict(colors=colors),
+        textinfo="percent+label",
+        hole=0.3,
+    ))
+    
+    fig.update_layout(
+        title="Distribución de tu huella hídrica diaria",
+        height=400
+    )
+    
+    return fig
+
+# Función para construir el gráfico de huella hídrica por categoría de alimentos
+@profiled
+def build_food_category_chart(footprint_by_category):
+    fig = go.Figure()
+    
+    fig.add_trace(go.Bar(
+        x=list(footprint_by_category.keys()),
+        y=list(footprint_by_category.values()),
+        marker_color="#FFA726"
+    ))
+    
+    fig.update_layout(
+        title="Huella hídrica diaria por categoría de alimentos (litros/día)",
+        xaxis_title="",
+        yaxis_title="Litros por día",
+        height=400
+    )
+    
+    return fig
+
+# Sección: huella hídrica
+def render():
+    st.header("Calculadora de Huella Hídrica")
+    
+    st.markdown("""
+    La huella hídrica representa la cantidad total de agua dulce utilizada para producir los bienes y servicios que consumimos.
+    Incluye el agua consumida directamente (ducha, cocina, etc.) y el "agua virtual" usada para producir alimentos, productos y energía.
+    """)
+    
+    st.subheader("Calculadora de huella hídrica de alimentos")
+    
+    st.write("Selecciona las cantidades aproximadas de alimentos que consumes en una semana:")
+    
+    # Crear tabs para categorías de alimentos
+    food_cat1, food_cat2, food_cat3, food_cat4 = st.tabs([
+        "Carnes y lácteos", "Granos y vegetales", "Frutas", "Bebidas y otros"
+    ])
+    
+    food_inputs = {}
+    
+    with food_cat1:
+        col1, col2 = st.columns(2)
+        with col1:
+            food_inputs["carne_res"] = st.number_input(
+                f"Carne de res (kg/semana)", 
+                min_value=0.0, 
+                value=0.5, 
+                step=0.1,
+                format="%.1f"
+            )
+            food_inputs["carne_pollo"] = st.number_input(
+                f"Carne de pollo (kg/semana)", 
+                min_value=0.0, 
+                value=1.0, 
+                step=0.1,
+                format="%.1f"
+            )
+            food_inputs["carne_cerdo"] = st.number_input(
+                f"Carne de cerdo (kg/semana)", 
+                min_value=0.0, 
+                value=0.3, 
+                step=0.1,
+                format="%.1f"
+            )
+        with col2:
+            food_inputs["leche"] = st.number_input(
+                f"Leche (litros/semana)", 
+                min_value=0.0, 
+                value=2.0, 
+                step=0.5,
+                format="%.1f"
+            )
+            food_inputs["queso"] = st.number_input(
+                f"Queso (kg/semana)", 
+                min_value=0.0, 
+                value=0.2, 
+                step=0.1,
+                format="%.1f"
+            )
+            food_inputs["huevos"] = st.number_input(
+                f"Huevos (kg/semana - approx 1kg = 16 huevos)", 
+                min_value=0.0, 
+                value=0.5, 
+                step=0.1,
+                format="%.1f"
+            )
+    
+    with food_cat2:
+        col1, col2 = st.columns(2)
+        with col1:
+            food_inputs["arroz"] = st.number_input(
+                f"Arroz (kg/semana)", 
+                min_value=0.0, 
+                value=1.0, 
+                step=0.1,
+                format="%.1f"
+            )
+            food_inputs["papa"] = st.number_input(
+                f"Papa (kg/semana)", 
+                min_value=0.0, 
+                value=1.0, 
+                step=0.5,
+                format="%.1f"
+            )
+            food_inputs["trigo"] = st.number_input(
+                f"Pan/Trigo (kg/semana)", 
+                min_value=0.0, 
+                value=0.7, 
+                step=0.1,
+                format="%.1f"
+            )
+        with col2:
+            food_inputs["tomate"] = st.number_input(
+                f"Tomate (kg/semana)", 
+                min_value=0.0, 
+                value=0.5, 
+                step=0.1,
+                format="%.1f"
+            )
+            food_inputs["lechuga"] = st.number_input(
+                f"Lechuga (kg/semana)", 
+                min_value=0.0, 
+                value=0.3, 
+                step=0.1,
+                format="%.1f"
+            )
+            food_inputs["maiz"] = st.number_input(
+                f"Maíz (kg/semana)", 
+                min_value=0.0, 
+                value=0.3, 
+                step=0.1,
+                format="%.1f"
+            )
+    
+    with food_cat3:
+        col1, col2 = st.columns(2)
+        with col1:
+            food_inputs["manzana"] = st.number_input(
+                f"Manzana (kg/semana)", 
+                min_value=0.0, 
+                value=0.5, 
+                step=0.1,
+                format="%.1f"
+            )
+            food_inputs["platano"] = st.number_input(
+                f"Plátano/Banana (kg/semana)", 
+                min_value=0.0, 
+                value=0.5, 
+                step=0.1,
+                format="%.1f"
+            )
+        with col2:
+            # Espacio para futuras frutas
+            pass
+    
+    with food_cat4:
+        col1, col2 = st.columns(2)
+        with col1:
+            food_inputs["cafe"] = st.number_input(
+                f"Café (kg/semana, ~60g = 10 tazas)", 
+                min_value=0.0, 
+                value=0.1, 
+                step=0.05,
+                format="%.2f"
+            )
+            food_inputs["chocolate"] = st.number_input(
+                f"Chocolate (kg/semana)", 
+                min_value=0.0, 
+                value=0.1, 
+                step=0.05,
+                format="%.2f"
+            )
+            food_inputs["azucar"] = st.number_input(
+                f"Azúcar (kg/semana)", 
+                min_value=0.0, 
+                value=0.3, 
+                step=0.1,
+                format="%.1f"
+            )
+        with col2:
+            food_inputs["aceite_oliva"] = st.number_input(
+                f"Aceite de oliva (litros/semana)", 
+                min_value=0.0, 
+                value=0.1, 
+                step=0.05,
+                format="%.2f"
+            )
+            food_inputs["cerveza"] = st.number_input(
+                f"Cerveza (litros/semana)", 
+                min_value=0.0, 
+                value=0.5, 
+                step=0.5,
+                format="%.1f"
+            )
+            food_inputs["vino"] = st.number_input(
+                f"Vino (litros/semana)", 
+                min_value=0.0, 
+                value=0.2, 
+                step=0.1,
+                format="%.1f"
+            )
+    
+    st.subheader("Huella hídrica de productos de consumo")
+    st.write("Indica la cantidad de productos que adquieres al mes:")
+    
+    product_inputs = {}
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        product_inputs["camiseta_algodon"] = st.number_input(
+            f"Camisetas de algodón (unidades/mes)", 
+            min_value=0.0, 
+            value=0.5, 
+            step=0.5,
+            format="%.1f"
+        )
+        product_inputs["jeans"] = st.number_input(
+            f"Jeans/pantalones (unidades/mes)", 
+            min_value=0.0, 
+            value=0.2, 
+            step=0.1,
+            format="%.1f"
+        )
+        product_inputs["zapatos_cuero"] = st.number_input(
+            f"Zapatos de cuero (pares/mes)", 
+            min_value=0.0, 
+            value=0.1, 
+            step=0.1,
+            format="%.1f"
+        )
+        
+    with col2:
+        product_inputs["papel"] = st.number_input(
+            f"Papel (hojas/día)", 
+            min_value=0.0, 
+            value=5.0, 
+            step=1.0,
+            format="%.0f"
+        )
+        product_inputs["smartphone"] = st.number_input(
+            f"Smartphone (unidades/año)", 
+            min_value=0.0, 
+            value=0.5, 
+            step=0.5,
+            format="%.1f"
+        )
+        product_inputs["computadora"] = st.number_input(
+            f"Computadora/Laptop (unidades/año)", 
+            min_value=0.0, 
+            value=0.3, 
+            step=0.1,
+            format="%.1f"
+        )
+    
+    # Mostrar resultados de huella hídrica
+    st.subheader("Resultados de tu huella hídrica")
+    
+    # Obtener consumo directo de agua (según datos registrados)
+    weekly_consumption = get_user_aggregate("weekly", st.session_state.user)
+    direct_water_use = sum(weekly_consumption.values()) / 7 if weekly_consumption else NATIONAL_AVG_CONSUMPTION
+    
+    # Calcular la huella hídrica diaria (categorías y periodos según data.py)
+    footprint = get_footprint_model().score({**food_inputs, **product_inputs}, direct_water_use)
+    daily_food_footprint = footprint["food"]
+    total_product_footprint = footprint["products"]
+    total_water_footprint = footprint["total"]
+    footprint_by_category = {
+        category: liters for category, liters in footprint["by_category"].items()
+        if category != PRODUCTS_CATEGORY
+    }
+    
+    # Mostrar resultados
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.metric("Huella hídrica total", f"{total_water_footprint:.0f} litros/día")
+        
+        fig = cached_figure(build_footprint_pie, direct_water_use, daily_food_footprint,
+                            total_product_footprint)
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        # Mostrar desglose por categorías
+        st.subheader("Detalle de tu huella hídrica")
+        
+        st.write(f"**Uso directo de agua:** {direct_water_use:.0f} litros/día")
+        st.write(f"**Huella hídrica de alimentos:** {daily_food_footprint:.0f} litros/día")
+        st.write(f"**Huella hídrica de productos:** {total_product_footprint:.0f} litros/día")
+        
+        # Mostrar gráfico de barras por categorías de alimentos
+        fig = cached_figure(build_food_category_chart, footprint_by_category)
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Consejos para reducir la huella hídrica
+    st.subheader("Consejos para reducir tu huella hídrica")
+    
+    # Identificar las categorías de mayor consumo
+    if footprint_by_category["Carnes"] > daily_food_footprint * 0.3:
+        st.info("💡 **Reduce el consumo de carne**: La producción de carne, especialmente de res, requiere enormes cantidades de agua. Intenta tener un día a la semana sin carne.")
+    
+    if daily_food_footprint > total_product_footprint * 2:
+        st.info("💡 **Evita el desperdicio de alimentos**: Aproximadamente un tercio de los alimentos producidos se desperdician. Planifica tus comidas y compras para evitar tirar comida.")
+    
+    if total_product_footprint > 100:
+        st.info("💡 **Extiende la vida útil de tus productos**: Reparar y mantener tus dispositivos electrónicos, ropa y calzado en lugar de reemplazarlos reduce significativamente tu huella hídrica.")
+        
+    st.info("💡 **Consume local y de temporada**: Los alimentos locales y de temporada generalmente requieren menos agua para su producción y transporte.")
@@ -0,0 +1,106 @@
+import streamlit as st
+
+from consumption import DAILY_LIMIT
+from figure_cache import cached_figure
+from households import create_household, join_household, leave_household, list_households
+from views.common import build_weekly_chart, get_user_aggregate, invalidate_user_aggregates
+
+# Meses que se muestran en el detalle mensual del hogar
+HOUSEHOLD_MONTHS = 6
+
+# Acciones del hogar: como callbacks se aplican antes de volver a dibujar
+# el fragmento, sin necesidad de st.rerun()
+def create_and_join_household():
+    username = st.session_state.user
+    try:
+        name = create_household(st.session_state.household_name, get_user_aggregate("city", username))
+        join_household(username, name)
+    except ValueError as e:
+        st.session_state.household_error = str(e)
+    invalidate_user_aggregates(username)
+
+def join_selected_household():
+    try:
+        join_household(st.session_state.user, st.session_state.household_choice)
+    except ValueError as e:
+        st.session_state.household_error = str(e)
+    invalidate_user_aggregates(st.session_state.user)
+
+def leave_current_household():
+    leave_household(st.session_state.user)
+    invalidate_user_aggregates(st.session_state.user)
+
+# Sección: hogar
+@st.fragment
+def render():
+    st.header("Tu hogar")
+    
+    st.markdown("""
+    El agua se factura por conexión: agrupa a las personas que comparten tu conexión
+    en un hogar para ver el consumo y el costo de todos juntos.
+    """)
+    
+    if "household_error" in st.session_state:
+        st.error(st.session_state.pop("household_error"))
+    
+    summary = get_user_aggregate("household_summary", st.session_state.user)
+    
+    # Sin hogar: crear uno nuevo o unirse a uno existente
+    if summary is None:
+        col1, col2 = st.columns(2)
+    
+        with col1:
+            st.subheader("Crear un hogar")
+            with st.form("crear_hogar"):
+                st.text_input("Nombre del hogar", key="household_name")
+                st.form_submit_button("Crear y unirme", on_click=create_and_join_household)
+    
+        with col2:
+            st.subheader("Unirte a un hogar")
+            households = list_households()
+            if households:
+                st.selectbox("Hogar", households, key="household_choice")
+                st.button("Unirme", on_click=join_selected_household)
+            else:
+                st.info("Todavía no hay hogares creados.")
+        return
+    
+    members = summary["members"]
+    st.subheader(f"🏠 {summary['name']} ({len(members)} miembros)")
+    st.write("Miembros: " + ", ".join(members))
+    
+    # Totales del hogar en los últimos 30 días, ya agregados
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("Consumo de 30 días", f"{summary['total_liters']:.0f} litros")
+    
+    with col2:
+        per_person = summary["daily_average"] / max(len(members), 1)
+        st.metric("Promedio diario por persona", f"{per_person:.1f} litros",
+                  delta=f"{per_person - DAILY_LIMIT:.1f} vs. límite", delta_color="inverse")
+    
+    with col3:
+        st.metric("Costo de 30 días", f"S/ {summary['cost']:.2f}")
+    
+    st.caption(f"Tarifa aplicada en {summary['city']}: S/ {summary['rate']:.2f} por m³")
+    
+    # Consumo del hogar en la última semana
+    last_week = dict(list(summary["days"].items())[-7:])
+    fig = cached_figure(build_weekly_chart, last_week)
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Detalle mensual
+    st.subheader("Consumo y costo por mes")
+    months = sorted(summary["monthly_totals"].items())[-HOUSEHOLD_MONTHS:]
+    if months:
+        st.table([
+            {
+                "Mes": month,
+                "Litros": f"{liters:.0f}",
+                "Costo (S/)": f"{liters / 1000 * summary['rate']:.2f}",
+            }
+            for month, liters in reversed(months)
+        ])
+    
+    st.button("Salir del hogar", on_click=leave_current_household)
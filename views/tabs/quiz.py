@@ -0,0 +1,105 @@
+import streamlit as st
+
+from data import water_quiz
+from metrics import QUIZ_COMPLETIONS, QUIZ_SCORE
+
+# Acciones del quiz: como callbacks se aplican antes de volver a dibujar
+# el fragmento, sin necesidad de st.rerun()
+def start_quiz():
+    st.session_state.quiz_started = True
+    st.session_state.current_question = 0
+    st.session_state.correct_answers = 0
+
+def next_quiz_question():
+    st.session_state.current_question += 1
+
+def finish_quiz():
+    st.session_state.quiz_finished = True
+    st.session_state.quiz_started = False
+    QUIZ_COMPLETIONS.inc()
+    QUIZ_SCORE.observe(st.session_state.correct_answers)
+
+def restart_quiz():
+    st.session_state.quiz_finished = False
+
+# Sección: quiz del agua
+@st.fragment
+def render():
+    st.header("Quiz del agua: ¿Cuánto sabes sobre el agua?")
+    
+    st.markdown("""
+    Pon a prueba tus conocimientos sobre el agua y su conservación.
+    Este quiz te ayudará a aprender datos interesantes sobre este recurso vital.
+    """)
+    
+    # Inicializar el estado del quiz en la sesión
+    if 'quiz_started' not in st.session_state:
+        st.session_state.quiz_started = False
+        
+    if 'current_question' not in st.session_state:
+        st.session_state.current_question = 0
+        
+    if 'correct_answers' not in st.session_state:
+        st.session_state.correct_answers = 0
+        
+    if 'quiz_finished' not in st.session_state:
+        st.session_state.quiz_finished = False
+    
+    # Pantalla inicial del quiz
+    if not st.session_state.quiz_started and not st.session_state.quiz_finished:
+        st.subheader("¿Listo para demostrar tus conocimientos?")
+        
+        st.write("Este quiz consta de 10 preguntas sobre el agua, su uso y conservación.")
+        st.write("Cada respuesta correcta suma un punto. ¿Cuántos puntos puedes conseguir?")
+        
+        st.button("Comenzar Quiz", type="primary", on_click=start_quiz)
+    
+    # Quiz en progreso
+    elif st.session_state.quiz_started and not st.session_state.quiz_finished:
+        # Mostrar la pregunta actual
+        question_data = water_quiz[st.session_state.current_question]
+        
+        st.subheader(f"Pregunta {st.session_state.current_question + 1} de {len(water_quiz)}")
+        st.markdown(f"### {question_data['question']}")
+        
+        # Permitir al usuario seleccionar una respuesta
+        answer = st.radio("Selecciona tu respuesta:", question_data['options'], key="quiz_answer")
+        
+        # Botón para confirmar respuesta
+        if st.button("Confirmar respuesta"):
+            if answer == question_data['correct_answer']:
+                st.success("¡Correcto! 🎉")
+                st.session_state.correct_answers += 1
+            else:
+                st.error(f"Incorrecto. La respuesta correcta es: {question_data['correct_answer']}")
+            
+            st.info(f"**Explicación:** {question_data['explanation']}")
+            
+            # Progreso
+            st.progress((st.session_state.current_question + 1) / len(water_quiz))
+            
+            # Botón para continuar
+            if st.session_state.current_question < len(water_quiz) - 1:
+                st.button("Siguiente pregunta", on_click=next_quiz_question)
+            else:
+                st.button("Ver resultados", on_click=finish_quiz)
+    
+    # Quiz finalizado - mostrar resultados
+    elif st.session_state.quiz_finished:
+        st.subheader("¡Quiz completado!")
+        
+        # Mostrar puntuación
+        st.markdown(f"### Tu puntuación: {st.session_state.correct_answers} de {len(water_quiz)}")
+        
+        # Interpretar la puntuación
+        if st.session_state.correct_answers >= 8:
+            st.success("¡Excelente! 🌊 Eres un experto en el tema del agua.")
+        elif st.session_state.correct_answers >= 6:
+            st.info("¡Buen trabajo! 💧 Tienes buenos conocimientos sobre el agua.")
+        elif st.session_state.correct_answers >= 4:
+            st.warning("No está mal. 🚿 Aún puedes aprender más sobre el agua.")
+        else:
+            st.error("Aún hay espacio para mejorar. 🌱 Sigue aprendiendo sobre este recurso vital.")
+        
+        # Botón para reiniciar el quiz
+        st.button("Reiniciar Quiz", on_click=restart_quiz)
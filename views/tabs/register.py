@@ -0,0 +1,61 @@
+import streamlit as st
+
+from data import water_activities
+from users import register_consumption
+from views.common import invalidate_user_aggregates, show_tips
+
+# Sección: registrar consumo
+# Las secciones con formularios y botones son fragmentos: al interactuar con
+# ellas sólo se vuelve a ejecutar la propia sección y no todo el script.
+@st.fragment
+def render():
+    st.header("Registra tu consumo de agua diario")
+    
+    st.write("Selecciona las actividades que has realizado hoy y la cantidad de veces:")
+    
+    with st.form("registro_consumo"):
+        activities_input = {}
+        
+        # Dividir actividades en columnas
+        col1, col2 = st.columns(2)
+        
+        items = list(water_activities.items())
+        half = len(items) // 2
+        
+        with col1:
+            for activity, details in items[:half]:
+                activities_input[activity] = st.number_input(
+                    f"{details['name']} ({details['liters']} litros por uso)",
+                    min_value=0,
+                    step=1,
+                    value=0
+                )
+        
+        with col2:
+            for activity, details in items[half:]:
+                activities_input[activity] = st.number_input(
+                    f"{details['name']} ({details['liters']} litros por uso)",
+                    min_value=0,
+                    step=1,
+                    value=0
+                )
+        
+        submitted = st.form_submit_button("Registrar consumo")
+        
+        if submitted:
+            if sum(activities_input.values()) > 0:
+                total = register_consumption(st.session_state.user, activities_input)
+                invalidate_user_aggregates(st.session_state.user)
+                
+                st.success(f"¡Consumo registrado! Total: {total:.1f} litros")
+                
+                if total > 100:
+                    st.warning("⚠️ **¡Alerta!** Has superado el límite recomendado de 100 litros diarios.")
+                
+                # Mostrar consejo después del registro
+                show_tips(st.session_state.user, total)
+                
+                # Los gráficos están en otras secciones y se recalculan al abrirlas:
+                # los agregados memorizados ya se descartaron
+            else:
+                st.warning("Debes seleccionar al menos una actividad para registrar.")
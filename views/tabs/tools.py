@@ -0,0 +1,203 @@
+from itertools import islice
+
+import pandas as pd
+import streamlit as st
+
+from data import water_sources
+from exporter import EXPORT_FORMATS, export_bytes, export_key, iter_export_rows
+from importer import import_consumption
+from savings_simulator import simulate
+from users import load_user
+from utils import calculate_visual_impact
+from views.common import get_user_aggregate, invalidate_user_aggregates
+
+# Filas de la vista previa de la exportación
+EXPORT_PREVIEW_ROWS = 100
+
+# Escenarios que se muestran en el simulador de ahorro
+SIMULATOR_ROWS = 10
+
+# Acción del botón de exportación: como callback se aplica antes de volver a
+# dibujar la sección, que ya muestra el botón de descarga
+def prepare_export(key):
+    st.session_state["_export_key"] = key
+
+# Sección: herramientas
+def render():
+    st.header("Herramientas adicionales")
+    
+    # Subtabs para diferentes herramientas
+    tool_tab1, tool_tab2, tool_tab3, tool_tab4, tool_tab5 = st.tabs([
+        "Exportar datos", 
+        "Importar datos",
+        "Convertidor de unidades", 
+        "Fuentes de agua",
+        "Simulador de ahorro"
+    ])
+    
+    with tool_tab1:
+        st.subheader("Exportar tus datos de consumo")
+        
+        # Obtener datos del usuario
+        user = load_user(st.session_state.user)
+        if user is not None:
+            consumption_data = user.get("consumption", {})
+            
+            if consumption_data:
+                # Formatos disponibles (Parquet sólo si está instalado pyarrow)
+                export_format = st.radio(
+                    "Formato",
+                    list(EXPORT_FORMATS),
+                    format_func=str.upper,
+                    horizontal=True
+                )
+                _, mime, extension = EXPORT_FORMATS[export_format]
+                
+                # El archivo sólo se genera (por bloques) cuando se pide, y se reutiliza
+                # mientras el historial y el formato no cambien
+                key = export_key(st.session_state.user, user, export_format)
+                if st.session_state.get("_export_key") != key:
+                    st.button(f"Preparar descarga ({export_format.upper()})",
+                              on_click=prepare_export, args=(key,))
+                else:
+                    st.download_button(
+                        label=f"Descargar datos ({export_format.upper()})",
+                        data=export_bytes(st.session_state.user, user, export_format),
+                        file_name=f"h2omiga_datos_{st.session_state.user}.{extension}",
+                        mime=mime,
+                    )
+                
+                # Vista previa de los datos: sólo las primeras filas
+                st.subheader("Vista previa de tus datos")
+                st.dataframe(pd.DataFrame(islice(iter_export_rows(user), EXPORT_PREVIEW_ROWS)))
+                
+                if sum(len(activities) for activities in consumption_data.values()) > EXPORT_PREVIEW_ROWS:
+                    st.caption(f"Se muestran las primeras {EXPORT_PREVIEW_ROWS} filas; la descarga incluye todo tu historial.")
+            else:
+                st.info("Aún no tienes datos de consumo registrados.")
+    
+    with tool_tab2:
+        st.subheader("Importar consumo histórico")
+        
+        st.write("Sube un archivo CSV con las columnas Fecha, Actividad y Cantidad (el mismo formato de la exportación).")
+        
+        uploaded_file = st.file_uploader("Archivo CSV", type="csv")
+        replace_days = st.checkbox("Reemplazar los días que ya tengo registrados")
+        
+        if uploaded_file is not None and st.button("Importar datos", type="primary"):
+            try:
+                result = import_consumption(st.session_state.user, uploaded_file, replace=replace_days)
+            except ValueError as e:
+                st.error(str(e))
+            else:
+                if result.error_count:
+                    st.error(f"No se importó nada: {result.error_count} filas tienen errores.")
+                    for error in result.errors[:10]:
+                        st.write(f"- {error}")
+                elif result.rows:
+                    invalidate_user_aggregates(st.session_state.user)
+                    st.success(f"¡Datos importados! {result.rows} filas de {result.days} días.")
+                else:
+                    st.warning("El archivo no contiene filas para importar.")
+    
+    with tool_tab3:
+        st.subheader("Convertidor de unidades de agua")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            quantity = st.number_input("Cantidad", min_value=0.0, value=100.0, step=10.0)
+            from_unit = st.selectbox("De:", [
+                "Litros", "Metros cúbicos", "Galones (US)", "Botellas (500ml)", 
+                "Duchas (70L)", "Descargas inodoro (9L)"
+            ])
+        
+        with col2:
+            to_unit = st.selectbox("A:", [
+                "Litros", "Metros cúbicos", "Galones (US)", "Botellas (500ml)", 
+                "Duchas (70L)", "Descargas inodoro (9L)"
+            ])
+            
+            # Factores de conversión a litros
+            to_liters = {
+                "Litros": 1,
+                "Metros cúbicos": 1000,
+                "Galones (US)": 3.78541,
+                "Botellas (500ml)": 0.5,
+                "Duchas (70L)": 70,
+                "Descargas inodoro (9L)": 9
+            }
+            
+            # Realizar la conversión
+            litros = quantity * to_liters[from_unit]
+            result = litros / to_liters[to_unit]
+            
+            st.metric("Resultado", f"{result:.2f} {to_unit}")
+            
+        # Información adicional sobre equivalencias
+        if st.checkbox("Mostrar equivalencias visuales"):
+            # Convertir la cantidad a litros para las equivalencias
+            liters = quantity * to_liters[from_unit]
+            
+            impact = calculate_visual_impact(liters)
+            
+            st.subheader("Equivalencias visuales")
+            
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                st.metric("Botellas de agua (500ml)", f"{impact['bottles']}")
+                st.metric("Duchas típicas", f"{impact['showers']}")
+            
+            with col2:
+                st.metric("Descargas de inodoro", f"{impact['toilets']}")
+                st.metric("Riego de plantas", f"{impact['plants']}")
+            
+            with col3:
+                st.metric("% de piscina estándar", f"{impact['swimming_pools']*100:.4f}%")
+                st.metric("Consumo diario (personas)", f"{impact['days_for_person']:.1f}")
+    
+    with tool_tab4:
+        st.subheader("Fuentes de agua accesibles")
+        
+        # Obtener la ciudad del usuario
+        city = get_user_aggregate("city", st.session_state.user)
+        
+        st.write(f"Fuentes de agua gratuitas o económicas en {city}:")
+        
+        if city in water_sources:
+            for source in water_sources[city]:
+                with st.expander(f"{source['name']} ({source['type']})"):
+                    st.write(f"**Dirección:** {source['address']}")
+                    st.write(f"**Tipo:** {source['type']}")
+        else:
+            st.info(f"Actualmente no tenemos información sobre fuentes de agua en {city}. Estamos trabajando para añadir más ciudades.")
+            
+            # Mostrar algunas fuentes generales
+            st.write("Sin embargo, puedes considerar estas opciones generales:")
+            st.write("1. **Oficinas municipales de agua**: Suelen ofrecer agua a bajo costo.")
+            st.write("2. **Piletas públicas**: En plazas y parques principales.")
+            st.write("3. **Comunícate con tu empresa de agua local**: Pueden tener programas especiales.")
+    
+    with tool_tab5:
+        st.subheader("¿Cuánto ahorrarías con cada consejo?")
+        
+        st.write("Aplicamos cada consejo de ahorro, y sus combinaciones, a todo tu historial de consumo.")
+        
+        user = load_user(st.session_state.user)
+        scenarios = simulate(user) if user is not None else []
+        
+        if scenarios:
+            st.dataframe(pd.DataFrame([
+                {
+                    "Consejos": " + ".join(scenario["descriptions"]) if len(scenario["tips"]) <= 2
+                                else f"Todos los consejos ({len(scenario['tips'])})",
+                    "Litros al mes": round(scenario["monthly_liters"], 1),
+                    "Soles al mes": round(scenario["monthly_soles"], 2),
+                    "% de tu consumo": round(scenario["percent"], 1),
+                }
+                for scenario in scenarios[:SIMULATOR_ROWS]
+            ]), hide_index=True)
+            st.caption(f"Proyección mensual según tu historial y la tarifa de agua de {get_user_aggregate('city', st.session_state.user)}.")
+        else:
+            st.info("Registra tu consumo para simular cuánto podrías ahorrar.")
@@ -0,0 +1,24 @@
+import streamlit as st
+
+from users import get_user_city
+
+# Pantalla de bienvenida
+def render():
+    st.title(f"Bienvenido/a a H2Omiga, {st.session_state.user}!")
+    st.write(f"Tu ciudad: {get_user_city(st.session_state.user)}")
+    
+    st.markdown("""
+    ### ¿Qué puedes hacer en H2Omiga?
+    
+    * 📝 Registrar tu consumo diario de agua
+    * 📊 Visualizar tu consumo semanal
+    * 🚨 Recibir alertas cuando superes el límite recomendado
+    * 💡 Obtener consejos personalizados para ahorrar agua
+    * 💰 Calcular tu ahorro potencial
+    
+    ¡Comencemos a cuidar juntos este recurso vital!
+    """)
+    
+    if st.button("Continuar a mi panel", type="primary"):
+        st.session_state.step = 'dashboard'
+        st.rerun()
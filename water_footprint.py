@@ -0,0 +1,250 @@
+# Cálculo de la huella hídrica de alimentos y productos
+#
+# La categoría y el periodo de cada elemento vienen de food_water_footprint y
+# product_water_footprint (data.py). Con ellos se arma una vez una matriz de
+# pesos elementos x categorías en litros por día, y la huella de uno o muchos
+# perfiles de consumo es un único producto matricial: perfiles x elementos
+# por elementos x categorías.
+#
+# También se puede calcular por lotes desde la terminal, p. ej. para datos de
+# hogares o encuestas: un CSV con una columna por elemento (carne_res,
+# jeans, ...) en las unidades y periodos del catálogo, y opcionalmente
+# uso_directo (litros/día). Las demás columnas se copian al resultado.
+#
+# Uso: python water_footprint.py encuesta.csv [--out resultados.csv]
+
+import argparse
+import csv
+import math
+import sys
+import threading
+
+import numpy as np
+
+from data import (
+    FOOD_CATEGORIES, FOOTPRINT_PERIOD_DAYS, NATIONAL_AVG_CONSUMPTION,
+    food_water_footprint, product_water_footprint
+)
+
+PRODUCTS_CATEGORY = "Productos"
+DIRECT_COLUMN = "uso_directo"
+
+# Filas del CSV que se calculan juntas
+BATCH_ROWS = 10000
+
+
+class FootprintModel:
+    """
+    Pesos de la huella hídrica por elemento y categoría, en litros por día
+    """
+
+    def __init__(self, foods, products):
+        self.items = list(foods) + list(products)
+        self.index = {key: i for i, key in enumerate(self.items)}
+        self.categories = FOOD_CATEGORIES + [PRODUCTS_CATEGORY]
+        category_index = {category: i for i, category in enumerate(self.categories)}
+
+        self.weights = np.zeros((len(self.items), len(self.categories)))
+        for key, item in list(foods.items()) + list(products.items()):
+            category = item["category"] if key in foods else PRODUCTS_CATEGORY
+            if category not in category_index:
+                raise ValueError(f"Categoría desconocida para {key}: {category}")
+            if item["period"] not in FOOTPRINT_PERIOD_DAYS:
+                raise ValueError(f"Periodo desconocido para {key}: {item['period']}")
+            self.weights[self.index[key], category_index[category]] = (
+                item["water_footprint"] / FOOTPRINT_PERIOD_DAYS[item["period"]]
+            )
+
+    def matrix(self, profiles):
+        """
+        Convierte perfiles {elemento: cantidad} en una matriz perfiles x elementos
+        """
+        amounts = np.zeros((len(profiles), len(self.items)))
+        for row, profile in enumerate(profiles):
+            for key, amount in profile.items():
+                if key not in self.index:
+                    raise ValueError(f"Elemento desconocido en la huella hídrica: {key}")
+                amounts[row, self.index[key]] = amount
+        return amounts
+
+    def score_matrix(self, amounts, direct=None):
+        """
+        Calcula la huella diaria de una matriz de cantidades
+
+        Args:
+            amounts: Matriz perfiles x elementos (columnas en el orden de self.items)
+            direct: Uso directo de agua por perfil en litros/día (por defecto
+                el promedio nacional)
+
+        Returns:
+            Dict de vectores: "by_category" (perfiles x categorías), "food",
+            "products", "direct" y "total"
+        """
+        by_category = amounts @ self.weights
+        food = by_category[:, :-1].sum(axis=1)
+        products = by_category[:, -1]
+        if direct is None:
+            direct = np.full(len(amounts), NATIONAL_AVG_CONSUMPTION, dtype=float)
+        direct = np.asarray(direct, dtype=float)
+        return {
+            "by_category": by_category,
+            "food": food,
+            "products": products,
+            "direct": direct,
+            "total": direct + food + products,
+        }
+
+    def score_profiles(self, profiles, direct=None):
+        """
+        Calcula la huella diaria de muchos perfiles {elemento: cantidad} a la vez
+
+        Returns:
+            Lista de dicts con la huella de alimentos, productos, uso directo,
+            total y desglose por categoría (litros/día)
+        """
+        scores = self.score_matrix(self.matrix(profiles), direct)
+        return [
+            {
+                "food": float(scores["food"][row]),
+                "products": float(scores["products"][row]),
+                "direct": float(scores["direct"][row]),
+                "total": float(scores["total"][row]),
+                "by_category": dict(zip(self.categories, scores["by_category"][row].tolist())),
+            }
+            for row in range(len(profiles))
+        ]
+
+    def score(self, inputs, direct=None):
+        """
+        Calcula la huella diaria de un solo perfil
+        """
+        return self.score_profiles([inputs], None if direct is None else [direct])[0]
+
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_footprint_model():
+    """
+    Devuelve el modelo construido sobre los catálogos de data.py
+    """
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _model = FootprintModel(food_water_footprint, product_water_footprint)
+    return _model
+
+
+def _parse_amount(column, value, default=0.0):
+    """
+    Convierte una celda en una cantidad no negativa (vacía vale default)
+
+    Raises:
+        ValueError: Si la celda no es un número finito no negativo
+    """
+    if value is None or not value.strip():
+        return default
+    try:
+        amount = float(value)
+    except ValueError:
+        raise ValueError(f"cantidad inválida en {column}: '{value}'")
+    if not math.isfinite(amount) or amount < 0:
+        raise ValueError(f"la cantidad en {column} debe ser un número no negativo, no '{value}'")
+    return amount
+
+
+def parse_profile(row, columns):
+    """
+    Valida una fila del CSV
+
+    Returns:
+        Tupla (cantidades de columns, uso directo en litros por día)
+
+    Raises:
+        ValueError: Si alguna cantidad no es válida
+    """
+    amounts = [_parse_amount(column, row[column]) for column in columns]
+    direct = _parse_amount(DIRECT_COLUMN, row.get(DIRECT_COLUMN), NATIONAL_AVG_CONSUMPTION)
+    return amounts, direct
+
+
+def score_csv(source, target, model=None):
+    """
+    Calcula la huella de cada fila de un CSV y escribe el resultado en otro
+
+    Las filas con cantidades inválidas no se escriben y se informan con su
+    número de línea.
+
+    Returns:
+        Tupla (número de filas calculadas, lista de errores)
+    """
+    model = model or get_footprint_model()
+    reader = csv.DictReader(source)
+    columns = [column for column in reader.fieldnames or [] if column in model.index]
+    extra = [column for column in reader.fieldnames or []
+             if column not in model.index and column != DIRECT_COLUMN]
+    if not columns:
+        raise ValueError("El archivo no tiene columnas de alimentos ni productos")
+
+    writer = csv.writer(target)
+    writer.writerow(extra + ["alimentos_litros_dia", "productos_litros_dia",
+                             "uso_directo_litros_dia", "total_litros_dia"] + model.categories)
+    positions = [model.index[column] for column in columns]
+    count = 0
+    errors = []
+
+    def flush(rows, profiles):
+        amounts = np.zeros((len(rows), len(model.items)))
+        amounts[:, positions] = [profile_amounts for profile_amounts, direct in profiles]
+        scores = model.score_matrix(amounts, [direct for profile_amounts, direct in profiles])
+        for i, row in enumerate(rows):
+            writer.writerow([row[column] for column in extra]
+                            + [round(float(scores[name][i]), 2) for name in ("food", "products", "direct", "total")]
+                            + [round(value, 2) for value in scores["by_category"][i].tolist()])
+
+    rows = []
+    profiles = []
+    for row in reader:
+        try:
+            profiles.append(parse_profile(row, columns))
+        except ValueError as e:
+            errors.append(f"Línea {reader.line_num}: {e}")
+            continue
+        rows.append(row)
+        if len(rows) == BATCH_ROWS:
+            flush(rows, profiles)
+            count += len(rows)
+            rows = []
+            profiles = []
+    if rows:
+        flush(rows, profiles)
+        count += len(rows)
+    return count, errors
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Calcula la huella hídrica de perfiles de consumo en lote")
+    parser.add_argument("source", help="CSV con una columna por alimento o producto")
+    parser.add_argument("--out", help="CSV de resultados (por defecto la salida estándar)")
+    args = parser.parse_args()
+
+    try:
+        with open(args.source, newline='', encoding='utf-8') as source:
+            if args.out:
+                with open(args.out, 'w', newline='', encoding='utf-8') as target:
+                    count, errors = score_csv(source, target)
+                print(f"{count} perfiles calculados en {args.out}")
+            else:
+                count, errors = score_csv(source, sys.stdout)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        raise SystemExit(1)
+
+    # Los errores van a stderr para no mezclarse con el CSV de la salida estándar
+    for error in errors:
+        print(error, file=sys.stderr)
+    if errors:
+        print(f"{len(errors)} filas con errores no se calcularon", file=sys.stderr)
+        raise SystemExit(1)
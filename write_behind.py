@@ -0,0 +1,151 @@
+# Escritura diferida del estado de poco valor (write-behind)
+#
+# Algunas modificaciones, como la rotación de consejos en tips_shown, se
+# producen al dibujar el panel y no justifican una escritura en disco en cada
+# ejecución del script. Se guardan en memoria por usuario (el conjunto de
+# usuarios pendientes) y un hilo en segundo plano las escribe juntas cada
+# H2OMIGA_WRITE_BEHIND_INTERVAL segundos (5 por defecto) con una sola
+# llamada a update_many del almacenamiento. Al terminar el proceso se
+# escribe lo que quede pendiente.
+#
+# Con H2OMIGA_WRITE_BEHIND_INTERVAL=0 las modificaciones se escriben en el
+# momento, como antes.
+#
+# Si el proceso termina de forma abrupta se pierden como mucho los cambios
+# del último intervalo; por eso sólo se usa para estado que se puede perder.
+# Si una escritura falla, el lote vuelve a la cola y el error se registra en
+# el log y en la métrica h2omiga_write_behind_failures_total.
+
+import atexit
+import copy
+import logging
+import os
+import threading
+
+from metrics import WRITE_BEHIND_FAILURES, WRITE_BEHIND_PENDING
+from storage import PartialUpdateError, get_storage
+
+DEFAULT_INTERVAL = 5
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindQueue:
+    """
+    Modificaciones diferidas por usuario, escritas en lote periódicamente
+    """
+
+    def __init__(self, storage, interval=DEFAULT_INTERVAL):
+        self.storage = storage
+        self.interval = interval
+        self._dirty = {}  # usuario -> [funciones de modificación, en orden]
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self._thread = None
+        if interval > 0:
+            self._thread = threading.Thread(target=self._run, name="h2omiga-write-behind", daemon=True)
+            self._thread.start()
+
+    def enqueue(self, username, update):
+        """
+        Añade una modificación de un usuario al próximo lote
+
+        La función recibe el registro guardado en ese momento y devuelve el
+        registro nuevo; se omite si el usuario ya no existe.
+        """
+        if self.interval <= 0:
+            self.storage.update_user(username, _skip_missing([update]))
+            return
+        with self._lock:
+            self._dirty.setdefault(username, []).append(update)
+            WRITE_BEHIND_PENDING.set(len(self._dirty))
+
+    def pending_view(self, username, record):
+        """
+        Devuelve una copia de record con las modificaciones pendientes aplicadas
+        """
+        with self._lock:
+            updates = list(self._dirty.get(username, ()))
+        if not updates or record is None:
+            return record
+        record = copy.deepcopy(record)
+        for update in updates:
+            record = update(record)
+        return record
+
+    def flush(self):
+        """
+        Escribe todas las modificaciones pendientes en una sola operación
+        """
+        with self._flush_lock:
+            with self._lock:
+                dirty, self._dirty = self._dirty, {}
+                WRITE_BEHIND_PENDING.set(0)
+            if not dirty:
+                return
+            try:
+                self.storage.update_many({
+                    username: _skip_missing(updates) for username, updates in dirty.items()
+                })
+            except Exception as e:
+                WRITE_BEHIND_FAILURES.inc()
+                # Si una parte se guardó, reintentar sólo lo que falló (repetir
+                # lo ya guardado duplicaría, p. ej., las entradas de tips_shown)
+                if isinstance(e, PartialUpdateError):
+                    dirty = {username: dirty[username] for username in e.errors}
+                # Devolver a la cola, antes de lo que haya llegado mientras tanto
+                with self._lock:
+                    for username, updates in dirty.items():
+                        self._dirty[username] = updates + self._dirty.get(username, [])
+                    WRITE_BEHIND_PENDING.set(len(self._dirty))
+                raise
+
+    def _run(self):
+        while not self._stopped:
+            self._wakeup.wait(self.interval)
+            try:
+                self.flush()
+            except Exception:
+                # Estado de poco valor: un fallo no debe detener el hilo, y el
+                # lote se reintenta en el próximo intervalo
+                logger.exception("No se pudieron escribir las modificaciones diferidas; se reintentará")
+
+    def close(self):
+        """
+        Detiene el hilo y escribe lo que quede pendiente
+        """
+        self._stopped = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+
+def _skip_missing(updates):
+    def apply(record):
+        if record is None:
+            return None
+        for update in updates:
+            record = update(record)
+        return record
+    return apply
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_write_behind():
+    """
+    Devuelve la cola de escritura diferida compartida por todo el proceso
+    """
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                interval = float(os.environ.get("H2OMIGA_WRITE_BEHIND_INTERVAL", DEFAULT_INTERVAL))
+                _queue = WriteBehindQueue(get_storage(), interval)
+                atexit.register(_queue.close)
+    return _queue